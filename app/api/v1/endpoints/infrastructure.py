@@ -12,7 +12,8 @@ from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.services.infrastructure_service import InfrastructureService
+from app.services.infrastructure_service import get_infrastructure_service
+from app.services.terraform_service import get_terraform_service
 
 router = APIRouter()
 
@@ -44,8 +45,8 @@ async def provision_infrastructure(
     # Generate unique operation ID
     operation_id = str(uuid.uuid4())
     
-    # Initialize infrastructure service
-    infrastructure_service = InfrastructureService()
+    # Shared infrastructure service
+    infrastructure_service = get_infrastructure_service()
     
     # Add background task
     background_tasks.add_task(
@@ -86,8 +87,8 @@ async def destroy_infrastructure(
     # Generate unique operation ID
     operation_id = str(uuid.uuid4())
     
-    # Initialize infrastructure service
-    infrastructure_service = InfrastructureService()
+    # Shared infrastructure service
+    infrastructure_service = get_infrastructure_service()
     
     # Add background task
     background_tasks.add_task(
@@ -120,7 +121,7 @@ async def get_operation_status(
     Returns:
         Dict containing operation status and details
     """
-    infrastructure_service = InfrastructureService()
+    infrastructure_service = get_infrastructure_service()
     operation_status = infrastructure_service.get_operation_status(operation_id)
     
     if not operation_status:
@@ -145,8 +146,8 @@ async def list_operations(
     Returns:
         Dict containing all operation statuses
     """
-    infrastructure_service = InfrastructureService()
-    operations = infrastructure_service.list_operations()
+    infrastructure_service = get_infrastructure_service()
+    operations = infrastructure_service.snapshot()
     
     return {
         "operations": operations,
@@ -169,7 +170,7 @@ async def cleanup_operations(
     Returns:
         Dict containing cleanup results
     """
-    infrastructure_service = InfrastructureService()
+    infrastructure_service = get_infrastructure_service()
     cleaned_count = infrastructure_service.cleanup_completed_operations(max_age_hours)
     
     return {
@@ -200,7 +201,7 @@ async def destroy_service_infrastructure(
     """
     try:
         # Run terraform destroy
-        terraform_service = TerraformService()
+        terraform_service = get_terraform_service()
         result = await terraform_service.destroy_infrastructure(service_name, environment)
         
         return {
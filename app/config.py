@@ -20,6 +20,9 @@ class Settings(BaseSettings):
     
     # Database Settings
     database_url: str = "sqlite+aiosqlite:///./platform_engineering.db"
+    database_query_cache_size: int = 500
+    database_pool_size: int = 20
+    database_max_overflow: int = 20
     
     # CORS Settings
     cors_origins: str = "http://localhost:3000,http://127.0.0.1:3000"
@@ -57,10 +60,14 @@ class Settings(BaseSettings):
     
     # Terraform Settings
     terraform_workspace_dir: str = "C:/tmp/terraform"
+    infrastructure_operation_ttl_hours: int = 24
+    infrastructure_max_operations: int = 10000
+    terraform_max_concurrent_operations: int = 4
     
     # Kubernetes Settings
     k8s_namespace: str = "platform-engineering"
     k8s_cluster_name: str = "platformdavid-local"
+    k8s_max_concurrent_applies: int = 5
     container_registry_url: str = "ghcr.io/platformdavid"
     
     # Monitoring Settings
@@ -4,9 +4,11 @@ Database configuration for the PlatformDavid Platform Engineering API.
 This module configures SQLAlchemy with async support for PostgreSQL.
 """
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 
@@ -15,10 +17,43 @@ engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    # Pooled asyncio connections; a sync QueuePool can deadlock the event loop
+    # and NullPool would reconnect on every request
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=settings.database_pool_size,
+    max_overflow=settings.database_max_overflow,
     pool_pre_ping=True,
     pool_recycle=300,
+    # Process-wide compiled SQL cache shared by every session on this engine
+    query_cache_size=settings.database_query_cache_size,
 )
 
+# Connection pragmas for SQLite: WAL lets readers run alongside the writer and
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """Apply the SQLite pragmas to each new pooled connection."""
+        # Stop the driver from managing transactions itself so SQLAlchemy's
+        # BEGIN (below) and SAVEPOINTs behave as on other databases
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+    
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin_sqlite_transaction(connection):
+        """Emit BEGIN explicitly now that the driver no longer does."""
+        connection.exec_driver_sql("BEGIN")
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -29,6 +64,9 @@ AsyncSessionLocal = sessionmaker(
 # Create declarative base
 Base = declarative_base()
 
+# Set once the tables have been created in this process
+_INITIALIZED = False
+
 
 async def get_db() -> AsyncSession:
     """
@@ -48,11 +86,18 @@ async def init_db() -> None:
     """
     Initialize database tables.
     
-    Creates all tables defined in the models.
+    Creates all tables defined in the models. Only the first call in a
+    process touches the database; later calls return immediately.
     """
+    global _INITIALIZED
+    if _INITIALIZED:
+        return
+    
     async with engine.begin() as conn:
         # Import all models here to ensure they are registered
         from app.models import deployment  # noqa
         
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+    
+    _INITIALIZED = True
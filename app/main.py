@@ -9,6 +9,7 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.config import settings
@@ -71,6 +72,9 @@ def create_application() -> FastAPI:
         allowed_hosts=["*"] if settings.debug else ["localhost", "127.0.0.1"]
     )
     
+    # Compress larger responses (service listings, OpenAPI schema); small ones aren't worth it
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    
     # Include API routes
     app.include_router(api_router, prefix="/api/v1")
     
@@ -110,13 +114,27 @@ async def health_check():
     }
 
 
+# Generate the OpenAPI schema now that every route is registered (FastAPI
+# caches it on app.openapi_schema) so the first /docs or /openapi.json
+# request doesn't pay for it
+app.openapi()
+
+
 if __name__ == "__main__":
     import uvicorn
     
+    # Prefer the libuv-based event loop (shipped with uvicorn[standard]) when available
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
     uvicorn.run(
         "app.main:app",
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        loop=loop
     )
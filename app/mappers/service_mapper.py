@@ -63,7 +63,7 @@ class ServiceMapper:
     @staticmethod
     def update_entity_from_dto(entity: Service, dto: ServiceUpdate) -> Service:
         """Update Service entity from ServiceUpdate DTO."""
-        update_data = dto.dict(exclude_unset=True)
+        update_data = dto.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             if hasattr(entity, field):
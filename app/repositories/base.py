@@ -4,9 +4,9 @@ Base repository for data access operations.
 This module provides a simple base repository pattern following Python conventions.
 """
 
-from typing import List, Optional, TypeVar, Generic
+from typing import Any, AsyncIterator, Dict, List, Optional, TypeVar, Generic
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 
 from app.models.base import Base
 
@@ -32,11 +32,8 @@ class BaseRepository(Generic[T]):
         self.model = model
     
     async def get_by_id(self, id: int) -> Optional[T]:
-        """Get entity by ID."""
-        result = await self.db.execute(
-            select(self.model).where(self.model.id == id)
-        )
-        return result.scalar_one_or_none()
+        """Get entity by ID, served from the session's identity map when already loaded."""
+        return await self.db.get(self.model, id)
     
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[T]:
         """Get all entities with pagination."""
@@ -45,6 +42,14 @@ class BaseRepository(Generic[T]):
         )
         return result.scalars().all()
     
+    async def iter_all(self, skip: int = 0, limit: int = 100) -> AsyncIterator[T]:
+        """Stream all entities with pagination, yielding rows as they arrive."""
+        result = await self.db.stream_scalars(
+            select(self.model).offset(skip).limit(limit)
+        )
+        async for entity in result:
+            yield entity
+    
     async def create(self, entity: T) -> T:
         """Create a new entity."""
         self.db.add(entity)
@@ -52,10 +57,25 @@ class BaseRepository(Generic[T]):
         await self.db.refresh(entity)
         return entity
     
+    async def bulk_create(self, records: List[Dict[str, Any]]) -> int:
+        """
+        Insert many rows with one executemany INSERT and a single commit.
+        
+        Args:
+            records: Column values for each row
+            
+        Returns:
+            int: Number of rows inserted
+        """
+        if not records:
+            return 0
+        await self.db.execute(insert(self.model), records)
+        await self.db.commit()
+        return len(records)
+    
     async def update(self, entity: T) -> T:
-        """Update an existing entity."""
+        """Update an existing entity; the session keeps the committed instance current."""
         await self.db.commit()
-        await self.db.refresh(entity)
         return entity
     
     async def delete(self, entity: T) -> bool:
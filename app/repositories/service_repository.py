@@ -4,8 +4,8 @@ Service repository for data access operations.
 This module implements the repository pattern for Service entities.
 """
 
-from typing import List, Optional
-from sqlalchemy import select
+from typing import AsyncIterator, List, Optional
+from sqlalchemy import Row, delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.service import Service, ServiceType, Environment, ServiceStatus
@@ -19,6 +19,30 @@ class ServiceRepository(BaseRepository[Service]):
         """Initialize ServiceRepository with database session."""
         super().__init__(db, Service)
     
+    async def create(self, entity: Service) -> Service:
+        """
+        Create a new service.
+        
+        Service uses eager defaults, so the INSERT returns server-generated
+        columns and no refresh is needed after commit.
+        """
+        self.db.add(entity)
+        await self.db.commit()
+        return entity
+    
+    async def delete_returning(self, service_id: int) -> Optional[Row]:
+        """
+        Delete a service in a single statement, returning its name and environment.
+        
+        The caller is responsible for committing.
+        """
+        result = await self.db.execute(
+            delete(Service)
+            .where(Service.id == service_id)
+            .returning(Service.name, Service.environment)
+        )
+        return result.first()
+    
     async def get_by_name(self, name: str) -> Optional[Service]:
         """Get service by name."""
         result = await self.db.execute(
@@ -36,6 +60,26 @@ class ServiceRepository(BaseRepository[Service]):
         )
         return result.scalars().all()
     
+    async def get_by_teams(self, teams: List[str]) -> List[Service]:
+        """Get services for several teams in one query, ordered by team."""
+        result = await self.db.execute(
+            select(Service)
+            .where(Service.team.in_(teams))
+            .order_by(Service.team, Service.id)
+        )
+        return result.scalars().all()
+    
+    async def iter_by_team(self, team: str, skip: int = 0, limit: int = 100) -> AsyncIterator[Service]:
+        """Stream services by team with pagination, yielding rows as they arrive."""
+        result = await self.db.stream_scalars(
+            select(Service)
+            .where(Service.team == team)
+            .offset(skip)
+            .limit(limit)
+        )
+        async for service in result:
+            yield service
+    
     async def get_by_type(self, service_type: ServiceType) -> List[Service]:
         """Get services by type."""
         result = await self.db.execute(
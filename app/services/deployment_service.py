@@ -37,8 +37,7 @@ class DeploymentService:
         Returns:
             Optional[Deployment]: Deployment if found, None otherwise
         """
-        result = await self.db.execute(select(Deployment).where(Deployment.id == deployment_id))
-        return result.scalar_one_or_none()
+        return await self.db.get(Deployment, deployment_id)
     
     async def get_deployment_by_name(self, name: str) -> Optional[Deployment]:
         """
@@ -129,7 +128,7 @@ class DeploymentService:
         if not deployment:
             return None
         
-        update_data = deployment_in.dict(exclude_unset=True)
+        update_data = deployment_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(deployment, field, value)
         
@@ -6,13 +6,29 @@ GitHub Actions is free for public repositories and provides 2000 minutes/month f
 """
 
 import httpx
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from functools import lru_cache
 import asyncio
 import base64
+import json
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is optional; fall back to httpx
+    aiohttp = None
 
 from app.config import settings
 from app.services.repository_file_service import RepositoryFileService
 
+_SERVICE_NAME_PLACEHOLDER = "{{SERVICE_NAME}}"
+
+
+@lru_cache(maxsize=32)
+def _template_files(service_type: str) -> Tuple[Tuple[str, str], ...]:
+    """Generate repository files once per service type with a service name placeholder."""
+    files = RepositoryFileService().generate_all_files(_SERVICE_NAME_PLACEHOLDER, service_type)
+    return tuple(files.items())
+
 
 class GitHubActionsService:
     """
@@ -31,6 +47,7 @@ class GitHubActionsService:
             "Authorization": f"token {self.api_token}",
             "Accept": "application/vnd.github.v3+json"
         }
+        self.json_headers = {**self.headers, "Content-Type": "application/json"}
 
     async def create_workflow(self, service_name: str, team: str, service_type: str) -> Dict[str, Any]:
         """
@@ -95,33 +112,59 @@ class GitHubActionsService:
 
     async def _create_repository_files(self, service_name: str, service_type: str) -> None:
         """Create all necessary files for the repository."""
-        file_service = RepositoryFileService()
-        files = file_service.generate_all_files(service_name, service_type)
+        files = {
+            file_path: content.replace(_SERVICE_NAME_PLACEHOLDER, service_name)
+            for file_path, content in _template_files(service_type)
+        }
         
-        for file_path, content in files.items():
-            await self._create_file(service_name, file_path, content)
-
-    async def _create_file(self, service_name: str, file_path: str, content: str) -> None:
+        if aiohttp is None:
+            for file_path, content in files.items():
+                await self._create_file(service_name, file_path, content)
+            return
+        
+        # Reuse one keep-alive aiohttp session for the whole file fan-out.
+        # Files are still committed one at a time: concurrent writes to the
+        # same branch make the contents API reject commits with 409.
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=20)
+        async with aiohttp.ClientSession(headers=self.json_headers, connector=connector) as session:
+            for file_path, content in files.items():
+                await self._create_file(service_name, file_path, content, session=session)
+
+    async def _create_file(
+        self,
+        service_name: str,
+        file_path: str,
+        content: str,
+        session: Optional["aiohttp.ClientSession"] = None
+    ) -> None:
         """Create a file in the repository."""
-        async with httpx.AsyncClient() as client:
-            file_data = {
-                "message": f"Add {file_path}",
-                "content": base64.b64encode(content.encode()).decode(),
-                "branch": "main"
-            }
-            
-            response = await client.put(
-                f"{self.base_url}/repos/{self.organization}/{service_name}/contents/{file_path}",
-                headers=self.headers,
-                json=file_data
-            )
-            
-            if response.status_code == 201:
-                print(f"✅ Created {file_path} in {service_name}")
-            elif response.status_code == 422:
-                print(f"⚠️ File {file_path} already exists in {service_name}")
-            else:
-                print(f"❌ Failed to create {file_path} in {service_name}: {response.status_code}")
+        url = f"{self.base_url}/repos/{self.organization}/{service_name}/contents/{file_path}"
+        
+        # Build the JSON body as bytes so the base64 payload never round-trips through str
+        payload = b'{"message":%b,"content":"%b","branch":"main"}' % (
+            json.dumps(f"Add {file_path}").encode(),
+            base64.b64encode(content.encode())
+        )
+        
+        if session is not None:
+            # Only the status code is needed, so the response body is never read
+            async with session.put(url, data=payload) as response:
+                status_code = response.status
+        else:
+            async with httpx.AsyncClient() as client:
+                request = client.build_request("PUT", url, headers=self.json_headers, content=payload)
+                
+                # Only the status code is needed, so skip reading the response body
+                response = await client.send(request, stream=True)
+                await response.aclose()
+                status_code = response.status_code
+        
+        if status_code == 201:
+            print(f"✅ Created {file_path} in {service_name}")
+        elif status_code == 422:
+            print(f"⚠️ File {file_path} already exists in {service_name}")
+        else:
+            print(f"❌ Failed to create {file_path} in {service_name}: {status_code}")
 
     async def _create_repository(self, service_name: str, service_type: str) -> None:
         """Create a new repository for the service."""
@@ -729,3 +772,9 @@ jobs:
         # This would generate a custom workflow based on the flags
         # For brevity, returning the standard workflow
         return self._generate_workflow_config(service_name, team, service_type)
+
+
+@lru_cache(maxsize=1)
+def get_github_actions_service() -> GitHubActionsService:
+    """Get the process-wide GitHubActionsService, created on first use."""
+    return GitHubActionsService()
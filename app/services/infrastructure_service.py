@@ -6,14 +6,59 @@ separating infrastructure concerns from API endpoints.
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import heapq
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from types import MappingProxyType
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Tuple
 from datetime import datetime
 import json
+import time
 
-from app.services.terraform_service import TerraformService
+from app.services.terraform_service import get_terraform_service
 from app.config import settings
 
 
+@dataclass(slots=True)
+class OpStatus:
+    """In-memory status of a single infrastructure operation."""
+    
+    status: str
+    service_name: str
+    environment: str
+    progress: str
+    started_ts: float
+    service_type: Optional[str] = None
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    cost_breakdown: Optional[Dict[str, Any]] = None
+    cost_savings: Optional[str] = None
+    completed_ts: Optional[float] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the status for API responses, with ISO timestamps."""
+        result: Dict[str, Any] = {
+            "status": self.status,
+            "started_at": datetime.utcfromtimestamp(self.started_ts).isoformat(),
+            "service_name": self.service_name
+        }
+        if self.service_type is not None:
+            result["service_type"] = self.service_type
+        result["environment"] = self.environment
+        result["progress"] = self.progress
+        result["outputs"] = self.outputs
+        result["error"] = self.error
+        if self.cost_breakdown is not None:
+            result["cost_breakdown"] = self.cost_breakdown
+        if self.cost_savings is not None:
+            result["cost_savings"] = self.cost_savings
+        if self.completed_ts is not None:
+            result["completed_at"] = datetime.utcfromtimestamp(self.completed_ts).isoformat()
+        return result
+
+
 class InfrastructureService:
     """
     Infrastructure service for managing Terraform operations.
@@ -24,8 +69,85 @@ class InfrastructureService:
     
     def __init__(self):
         """Initialize infrastructure service."""
-        self.terraform_service = TerraformService()
-        self._active_operations: Dict[str, Dict[str, Any]] = {}
+        self.terraform_service = get_terraform_service()
+        # LRU order: status reads move an operation to the end, eviction pops the front
+        self._active_operations: "OrderedDict[str, OpStatus]" = OrderedDict()
+        self._operations_view = MappingProxyType(self._active_operations)
+        # Completion times as epoch seconds, in completion order
+        self._completed_at: Dict[str, float] = {}
+        # Min-heap of (expiry epoch seconds, operation_id) drained by a background task
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_task: Optional[asyncio.Task] = None
+        # Per-operation locks with the number of tasks holding or awaiting each
+        self._op_locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+    
+    @asynccontextmanager
+    async def _operation_lock(self, operation_id: str) -> AsyncIterator[None]:
+        """Serialize work on one operation_id, dropping the lock once nobody uses it."""
+        lock, users = self._op_locks.get(operation_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._op_locks[operation_id] = (lock, users + 1)
+        
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._op_locks[operation_id]
+            if users == 1:
+                del self._op_locks[operation_id]
+            else:
+                self._op_locks[operation_id] = (lock, users - 1)
+    
+    def _start_operation(self, operation_id: str, operation: OpStatus) -> None:
+        """Track a new operation, evicting the least recently used ones when the cap is reached."""
+        self._completed_at.pop(operation_id, None)
+        self._active_operations.pop(operation_id, None)
+        while len(self._active_operations) >= settings.infrastructure_max_operations:
+            oldest_id, _ = self._active_operations.popitem(last=False)
+            self._completed_at.pop(oldest_id, None)
+        self._active_operations[operation_id] = operation
+    
+    def _finish_operation(self, operation_id: str, operation: OpStatus) -> None:
+        """Stamp an operation's completion time and schedule it for expiry."""
+        completed_ts = time.time()
+        operation.completed_ts = completed_ts
+        if self._active_operations.get(operation_id) is not operation:
+            # Evicted while running; nothing left to expire
+            return
+        self._completed_at[operation_id] = completed_ts
+        self._schedule_expiry(operation_id, completed_ts)
+    
+    def _schedule_expiry(self, operation_id: str, completed_ts: float) -> None:
+        """Queue a finished operation for removal once its TTL elapses."""
+        expires_at = completed_ts + settings.infrastructure_operation_ttl_hours * 3600
+        heapq.heappush(self._expiry_heap, (expires_at, operation_id))
+        
+        if self._expiry_task is None or self._expiry_task.done():
+            try:
+                self._expiry_task = asyncio.get_running_loop().create_task(self._expiry_loop())
+            except RuntimeError:
+                # No running event loop; cleanup_completed_operations still works
+                self._expiry_task = None
+    
+    async def _expiry_loop(self) -> None:
+        """Remove finished operations as they expire, sleeping until the next expiry."""
+        ttl_seconds = settings.infrastructure_operation_ttl_hours * 3600
+        
+        while self._expiry_heap:
+            expires_at, operation_id = self._expiry_heap[0]
+            delay = expires_at - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            
+            heapq.heappop(self._expiry_heap)
+            
+            # Skip stale entries for operations already removed or re-run since
+            completed_ts = self._completed_at.get(operation_id)
+            if completed_ts is not None and completed_ts + ttl_seconds <= time.time():
+                del self._completed_at[operation_id]
+                self._active_operations.pop(operation_id, None)
     
     async def provision_infrastructure_async(
         self, 
@@ -46,52 +168,65 @@ class InfrastructureService:
             environment: Environment (dev, staging, prod)
             operation_id: Unique operation identifier
         """
-        # Initialize operation status
-        self._active_operations[operation_id] = {
-            "status": "running",
-            "started_at": datetime.utcnow().isoformat(),
-            "service_name": service_name,
-            "service_type": service_type,
-            "environment": environment,
-            "progress": "Initializing Terraform...",
-            "outputs": {},
-            "error": None
-        }
-        
-        try:
-            # Update progress
-            self._active_operations[operation_id]["progress"] = "Generating Terraform configuration..."
-            
-            # Create infrastructure
-            result = await self.terraform_service.create_infrastructure(
+        async with self._operation_lock(operation_id):
+            # Initialize operation status
+            operation = OpStatus(
+                status="running",
                 service_name=service_name,
-                service_type=service_type,
-                environment=environment
+                environment=environment,
+                progress="Initializing Terraform...",
+                started_ts=time.time(),
+                service_type=service_type
             )
+            self._start_operation(operation_id, operation)
             
-            if result["status"] == "success":
-                self._active_operations[operation_id].update({
-                    "status": "completed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "progress": "Infrastructure provisioned successfully",
-                    "outputs": result.get("outputs", {}),
-                    "cost_breakdown": result.get("cost_breakdown", {})
-                })
-            else:
-                self._active_operations[operation_id].update({
-                    "status": "failed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "progress": "Infrastructure provisioning failed",
-                    "error": result.get("message", "Unknown error")
-                })
+            try:
+                # Update progress
+                operation.progress = "Generating Terraform configuration..."
+                
+                # Create infrastructure
+                result = await self.terraform_service.create_infrastructure(
+                    service_name=service_name,
+                    service_type=service_type,
+                    environment=environment
+                )
+                
+                if result["status"] == "success":
+                    operation.status = "completed"
+                    operation.progress = "Infrastructure provisioned successfully"
+                    operation.outputs = result.get("outputs", {})
+                    operation.cost_breakdown = result.get("cost_breakdown", {})
+                else:
+                    operation.status = "failed"
+                    operation.progress = "Infrastructure provisioning failed"
+                    operation.error = result.get("message", "Unknown error")
                 
-        except Exception as e:
-            self._active_operations[operation_id].update({
-                "status": "failed",
-                "completed_at": datetime.utcnow().isoformat(),
-                "progress": "Infrastructure provisioning failed",
-                "error": str(e)
-            })
+            except Exception as e:
+                operation.status = "failed"
+                operation.progress = "Infrastructure provisioning failed"
+                operation.error = str(e)
+            
+            self._finish_operation(operation_id, operation)
+    
+    async def provision_infrastructure_batch(self, specs: List[Dict[str, str]]) -> None:
+        """
+        Provision infrastructure for several services concurrently.
+        
+        Each spec carries the provision_infrastructure_async arguments
+        (service_name, service_type, environment, operation_id); progress
+        is tracked per operation_id as usual.
+        
+        Args:
+            specs: Provisioning arguments, one dict per service
+        """
+        # Cap concurrent Terraform runs so a large batch doesn't hit every AWS API at once
+        semaphore = asyncio.Semaphore(settings.terraform_max_concurrent_operations)
+        
+        async def provision(spec: Dict[str, str]) -> None:
+            async with semaphore:
+                await self.provision_infrastructure_async(**spec)
+        
+        await asyncio.gather(*(provision(spec) for spec in specs), return_exceptions=True)
     
     async def destroy_infrastructure_async(
         self, 
@@ -107,49 +242,42 @@ class InfrastructureService:
             environment: Environment (dev, staging, prod)
             operation_id: Unique operation identifier
         """
-        # Initialize operation status
-        self._active_operations[operation_id] = {
-            "status": "running",
-            "started_at": datetime.utcnow().isoformat(),
-            "service_name": service_name,
-            "environment": environment,
-            "progress": "Initializing Terraform destroy...",
-            "outputs": {},
-            "error": None
-        }
-        
-        try:
-            # Update progress
-            self._active_operations[operation_id]["progress"] = "Destroying infrastructure..."
-            
-            # Destroy infrastructure
-            result = await self.terraform_service.destroy_infrastructure(
+        async with self._operation_lock(operation_id):
+            # Initialize operation status
+            operation = OpStatus(
+                status="running",
                 service_name=service_name,
-                environment=environment
+                environment=environment,
+                progress="Initializing Terraform destroy...",
+                started_ts=time.time()
             )
+            self._start_operation(operation_id, operation)
             
-            if result["status"] == "success":
-                self._active_operations[operation_id].update({
-                    "status": "completed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "progress": "Infrastructure destroyed successfully",
-                    "cost_savings": result.get("cost_savings", "100%")
-                })
-            else:
-                self._active_operations[operation_id].update({
-                    "status": "failed",
-                    "completed_at": datetime.utcnow().isoformat(),
-                    "progress": "Infrastructure destruction failed",
-                    "error": result.get("message", "Unknown error")
-                })
+            try:
+                # Update progress
+                operation.progress = "Destroying infrastructure..."
                 
-        except Exception as e:
-            self._active_operations[operation_id].update({
-                "status": "failed",
-                "completed_at": datetime.utcnow().isoformat(),
-                "progress": "Infrastructure destruction failed",
-                "error": str(e)
-            })
+                # Destroy infrastructure
+                result = await self.terraform_service.destroy_infrastructure(
+                    service_name=service_name,
+                    environment=environment
+                )
+                
+                if result["status"] == "success":
+                    operation.status = "completed"
+                    operation.progress = "Infrastructure destroyed successfully"
+                    operation.cost_savings = result.get("cost_savings", "100%")
+                else:
+                    operation.status = "failed"
+                    operation.progress = "Infrastructure destruction failed"
+                    operation.error = result.get("message", "Unknown error")
+                
+            except Exception as e:
+                operation.status = "failed"
+                operation.progress = "Infrastructure destruction failed"
+                operation.error = str(e)
+            
+            self._finish_operation(operation_id, operation)
     
     def get_operation_status(self, operation_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -161,16 +289,35 @@ class InfrastructureService:
         Returns:
             Operation status or None if not found
         """
-        return self._active_operations.get(operation_id)
+        operation = self._active_operations.get(operation_id)
+        if operation is None:
+            return None
+        self._active_operations.move_to_end(operation_id)
+        return operation.to_dict()
     
-    def list_operations(self) -> Dict[str, Dict[str, Any]]:
+    def list_operations(self) -> Mapping[str, OpStatus]:
         """
         List all active infrastructure operations.
         
+        The result is a live read-only view of the OpStatus records and
+        must not be mutated; use snapshot() for a formatted copy.
+        
         Returns:
-            Dictionary of operation statuses
+            Read-only mapping of operation statuses
+        """
+        return self._operations_view
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
         """
-        return self._active_operations.copy()
+        Copy all active infrastructure operations for callers.
+        
+        Returns:
+            Dictionary of formatted operation statuses
+        """
+        return {
+            operation_id: operation.to_dict()
+            for operation_id, operation in self._active_operations.items()
+        }
     
     def cleanup_completed_operations(self, max_age_hours: int = 24) -> int:
         """
@@ -182,18 +329,28 @@ class InfrastructureService:
         Returns:
             Number of operations cleaned up
         """
-        current_time = datetime.utcnow()
+        cutoff = time.time() - max_age_hours * 3600
         operations_to_remove = []
         
-        for operation_id, operation in self._active_operations.items():
-            if operation["status"] in ["completed", "failed"]:
-                completed_at = datetime.fromisoformat(operation["completed_at"])
-                age_hours = (current_time - completed_at).total_seconds() / 3600
-                
-                if age_hours > max_age_hours:
-                    operations_to_remove.append(operation_id)
+        # Completion times are recorded in order, so stop at the first recent one
+        for operation_id, completed_ts in self._completed_at.items():
+            if completed_ts >= cutoff:
+                break
+            operations_to_remove.append(operation_id)
         
         for operation_id in operations_to_remove:
-            del self._active_operations[operation_id]
+            del self._completed_at[operation_id]
+            self._active_operations.pop(operation_id, None)
         
         return len(operations_to_remove)
+
+
+@lru_cache(maxsize=1)
+def get_infrastructure_service() -> InfrastructureService:
+    """
+    Get the process-wide InfrastructureService.
+    
+    Operation status lives in memory on the instance, so every caller must
+    share one to see operations started elsewhere.
+    """
+    return InfrastructureService()
@@ -5,18 +5,56 @@ This service coordinates CI/CD, infrastructure, and monitoring setup.
 Uses repository pattern similar to .NET services.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from itertools import groupby
 import asyncio
 
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.service import Service, ServiceStatus
 from app.schemas.service import ServiceCreate, ServiceUpdate, ServiceProvision
 from app.repositories.service_repository import ServiceRepository
 from app.mappers.service_mapper import ServiceMapper
-from app.services.github_actions_service import GitHubActionsService
-from app.services.infrastructure_service import InfrastructureService
-from app.services.kubernetes_service import KubernetesService
+from app.services.github_actions_service import get_github_actions_service
+from app.services.infrastructure_service import get_infrastructure_service
+from app.services.kubernetes_service import get_kubernetes_service
+from app.services.terraform_service import get_terraform_service
+
+
+@lru_cache(maxsize=1024)
+def _service_urls(name: str, environment: str) -> Dict[str, Any]:
+    """
+    Build the URLs and resource names derived from a service's name and environment.
+
+    The returned dict is cached and shared; copy mutable values before storing them.
+    """
+    return {
+        "repository": f"https://github.com/platformdavid/{name}",
+        "actions": f"https://github.com/platformdavid/{name}/actions",
+        "deployment": f"http://{name}.{environment}.platformdavid.com",
+        "monitoring": f"http://localhost:3000/d/{name}",
+        "logs": f"http://localhost:9090/graph?g0.expr=service%3D%22{name}%22",
+        "grafana_dashboard": f"dashboard-{name}-{environment}",
+        "prometheus_alerts": (f"high-error-rate-{name}", f"high-latency-{name}"),
+        "log_stream": f"service-{name}-{environment}"
+    }
+
+
+@asynccontextmanager
+async def _status_guard(service: Service, status_attr: str) -> AsyncIterator[None]:
+    """
+    Mark a service component as failed if the wrapped block raises or is cancelled.
+
+    Committing is left to the caller's transaction.
+    """
+    try:
+        yield
+    except BaseException:
+        setattr(service, status_attr, "failed")
+        raise
 
 
 class PlatformService:
@@ -27,6 +65,17 @@ class PlatformService:
     and monitoring for new services using industry-standard tools.
     """
 
+    # One instance is created per request; slots keep it small
+    __slots__ = (
+        "db",
+        "service_repository",
+        "_service_cache",
+        "github_actions_service",
+        "infrastructure_service",
+        "kubernetes_service",
+        "terraform_service",
+    )
+
     def __init__(self, db: AsyncSession):
         """
         Initialize PlatformService with database session.
@@ -36,9 +85,13 @@ class PlatformService:
         """
         self.db = db
         self.service_repository = ServiceRepository(db)
-        self.github_actions_service = GitHubActionsService()
-        self.infrastructure_service = InfrastructureService()
-        self.kubernetes_service = KubernetesService()
+        # Services loaded by ID during this request (PlatformService is per-request)
+        self._service_cache: Dict[int, Service] = {}
+        # Stateless clients are shared across requests; only the repository is per-session
+        self.github_actions_service = get_github_actions_service()
+        self.infrastructure_service = get_infrastructure_service()
+        self.kubernetes_service = get_kubernetes_service()
+        self.terraform_service = get_terraform_service()
 
     async def create_service(self, service_in: ServiceCreate) -> Service:
         """
@@ -70,35 +123,34 @@ class PlatformService:
         Returns:
             Service: Updated service with provisioning status
         """
-        service = await self.get_service_by_id(service_id)
+        # Lock the row for the whole provisioning transaction
+        result = await self.db.execute(
+            select(Service).where(Service.id == service_id).with_for_update()
+        )
+        service = result.scalar_one_or_none()
         if not service:
             raise ValueError(f"Service {service_id} not found")
 
-        # Update status to provisioning
+        # Update status to provisioning; all changes are committed once at the end
         service.status = ServiceStatus.PROVISIONING
-        await self.db.commit()
 
         try:
-            # Provision components in parallel
+            # Provision components in parallel; the first failure cancels the rest
             tasks = []
+            async with asyncio.TaskGroup() as task_group:
+                if provision_config.provision_cicd:
+                    tasks.append(task_group.create_task(self._provision_cicd(service)))
 
-            if provision_config.provision_cicd:
-                tasks.append(self._provision_cicd(service))
-
-            if provision_config.provision_infrastructure:
-                tasks.append(self._provision_infrastructure(service))
-
-            if provision_config.provision_monitoring:
-                tasks.append(self._provision_monitoring(service))
+                if provision_config.provision_infrastructure:
+                    tasks.append(task_group.create_task(self._provision_infrastructure(service)))
 
-            # Wait for all provisioning tasks to complete
-            if tasks:
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                if provision_config.provision_monitoring:
+                    tasks.append(task_group.create_task(self._provision_monitoring(service)))
 
-                # Check for any failures
-                for result in results:
-                    if isinstance(result, Exception):
-                        raise result
+            # Merge the JSON config patches into new dicts so they land in the single UPDATE
+            for task in tasks:
+                for column, patch in task.result().items():
+                    setattr(service, column, {**(getattr(service, column) or {}), **patch})
 
             # Update service status
             service.status = ServiceStatus.RUNNING
@@ -107,111 +159,110 @@ class PlatformService:
         except Exception as e:
             service.status = ServiceStatus.FAILED
             await self.db.commit()
+            # Surface the provisioner's own error rather than the TaskGroup wrapper
+            if isinstance(e, ExceptionGroup):
+                raise e.exceptions[0] from e
             raise e
 
-        await self.db.refresh(service)
         return service
 
-    async def _provision_cicd(self, service: Service) -> None:
+    async def _provision_cicd(self, service: Service) -> Dict[str, Dict[str, Any]]:
         """
         Provision CI/CD pipeline using GitHub Actions.
 
         Args:
             service: Service to provision CI/CD for
+
+        Returns:
+            Dict[str, Dict[str, Any]]: JSON config patches keyed by column name
         """
-        try:
+        # Resolve enum values and derived URLs once, before the first await
+        name = service.name
+        urls = _service_urls(name, service.environment.value)
+
+        async with _status_guard(service, "cicd_status"):
             # Create GitHub Actions workflow
             workflow_result = await self.github_actions_service.create_workflow(
-                service_name=service.name,
+                service_name=name,
                 team=service.team,
                 service_type=service.service_type.value
             )
 
             # Update CI/CD status
             service.cicd_status = "configured"
-            service.repository_url = f"https://github.com/platformdavid/{service.name}"
-
-            # Store workflow information in configuration
-            service.configuration["github_actions_workflow"] = {
-                "file": ".github/workflows/ci-cd.yml",
-                "status": "created",
-                "url": f"https://github.com/platformdavid/{service.name}/actions"
+            service.repository_url = urls["repository"]
+
+            # Workflow information for the service configuration
+            return {
+                "configuration": {
+                    "github_actions_workflow": {
+                        "file": ".github/workflows/ci-cd.yml",
+                        "status": "created",
+                        "url": urls["actions"]
+                    }
+                }
             }
 
-            await self.db.commit()
-
-        except Exception as e:
-            service.cicd_status = "failed"
-            await self.db.commit()
-            raise e
-
-    async def _provision_infrastructure(self, service: Service) -> None:
+    async def _provision_infrastructure(self, service: Service) -> Dict[str, Dict[str, Any]]:
         """
         Provision infrastructure using Terraform and Kubernetes.
 
         Args:
             service: Service to provision infrastructure for
+
+        Returns:
+            Dict[str, Dict[str, Any]]: JSON config patches keyed by column name
         """
-        try:
+        async with _status_guard(service, "infrastructure_status"):
             # Note: Infrastructure provisioning is now handled by background tasks
             # through the infrastructure endpoints. This method now just updates
             # the service status to indicate infrastructure provisioning is initiated.
             
             # Update infrastructure status to indicate provisioning started
             service.infrastructure_status = "provisioning"
-            service.deployment_url = f"http://{service.name}.{service.environment.value}.platformdavid.com"
+            service.deployment_url = _service_urls(service.name, service.environment.value)["deployment"]
             
-            # Store infrastructure information
-            service.infrastructure_config.update({
-                "provisioning_method": "background_task",
-                "status": "initiated"
-            })
-
-            await self.db.commit()
-
-        except Exception as e:
-            service.infrastructure_status = "failed"
-            await self.db.commit()
-            raise e
+            # Infrastructure information for the infrastructure config
+            return {
+                "infrastructure_config": {
+                    "provisioning_method": "background_task",
+                    "status": "initiated"
+                }
+            }
 
-    async def _provision_monitoring(self, service: Service) -> None:
+    async def _provision_monitoring(self, service: Service) -> Dict[str, Dict[str, Any]]:
         """
         Provision monitoring using local Prometheus and Grafana.
 
         Args:
             service: Service to provision monitoring for
+
+        Returns:
+            Dict[str, Dict[str, Any]]: JSON config patches keyed by column name
         """
-        try:
+        async with _status_guard(service, "monitoring_status"):
             # In a real implementation, this would:
             # 1. Create Grafana dashboard via API
             # 2. Configure Prometheus alerts
             # 3. Set up log aggregation
             # 4. Configure health checks
+            # Those calls would run here, concurrently with the other provisioners.
 
-            # For now, simulate monitoring provisioning
-            await asyncio.sleep(1)
+            urls = _service_urls(service.name, service.environment.value)
 
             # Update monitoring status
             service.monitoring_status = "configured"
-            service.monitoring_url = f"http://localhost:3000/d/{service.name}"
-            service.logs_url = f"http://localhost:9090/graph?g0.expr=service%3D%22{service.name}%22"
-
-            # Store monitoring configuration
-            service.monitoring_config.update({
-                "grafana_dashboard": f"dashboard-{service.name}-{service.environment.value}",
-                "prometheus_alerts": [
-                    f"high-error-rate-{service.name}",
-                    f"high-latency-{service.name}"
-                ],
-                "log_stream": f"service-{service.name}-{service.environment.value}"
-            })
-
-            await self.db.commit()
-
-        except Exception as e:
-            service.monitoring_status = "failed"
-            await self.db.commit()
-            raise e
+            service.monitoring_url = urls["monitoring"]
+            service.logs_url = urls["logs"]
+
+            # Monitoring information for the monitoring config
+            return {
+                "monitoring_config": {
+                    "grafana_dashboard": urls["grafana_dashboard"],
+                    "prometheus_alerts": list(urls["prometheus_alerts"]),
+                    "log_stream": urls["log_stream"]
+                }
+            }
 
     async def get_service_by_id(self, service_id: int) -> Optional[Service]:
         """
@@ -223,7 +274,12 @@ class PlatformService:
         Returns:
             Optional[Service]: Service if found, None otherwise
         """
-        return await self.service_repository.get_by_id(service_id)
+        service = self._service_cache.get(service_id)
+        if service is None:
+            service = await self.service_repository.get_by_id(service_id)
+            if service is not None:
+                self._service_cache[service_id] = service
+        return service
 
     async def get_service_by_name(self, service_name: str) -> Optional[Service]:
         """
@@ -251,6 +307,25 @@ class PlatformService:
         """
         return await self.service_repository.get_by_team(team, skip, limit)
 
+    async def get_services_by_teams(self, teams: List[str]) -> Dict[str, List[Service]]:
+        """
+        Get services for several teams with a single query.
+
+        Args:
+            teams: Team names
+
+        Returns:
+            Dict[str, List[Service]]: Services grouped by team; every requested team is present
+        """
+        services_by_team: Dict[str, List[Service]] = {team: [] for team in teams}
+        if not teams:
+            return services_by_team
+
+        services = await self.service_repository.get_by_teams(teams)
+        for team, team_services in groupby(services, key=lambda service: service.team):
+            services_by_team[team] = list(team_services)
+        return services_by_team
+
     async def get_all_services(self, skip: int = 0, limit: int = 100) -> List[Service]:
         """
         Get all services with pagination.
@@ -264,6 +339,35 @@ class PlatformService:
         """
         return await self.service_repository.get_all(skip, limit)
 
+    async def iter_services_by_team(self, team: str, skip: int = 0, limit: int = 100) -> AsyncIterator[Service]:
+        """
+        Stream services by team without materializing the whole page.
+
+        Args:
+            team: Team name
+            skip: Number of services to skip
+            limit: Maximum number of services to return
+
+        Yields:
+            Service: Services as rows arrive from the database
+        """
+        async for service in self.service_repository.iter_by_team(team, skip, limit):
+            yield service
+
+    async def iter_all_services(self, skip: int = 0, limit: int = 100) -> AsyncIterator[Service]:
+        """
+        Stream all services without materializing the whole page.
+
+        Args:
+            skip: Number of services to skip
+            limit: Maximum number of services to return
+
+        Yields:
+            Service: Services as rows arrive from the database
+        """
+        async for service in self.service_repository.iter_all(skip, limit):
+            yield service
+
     async def update_service(self, service_id: int, service_in: ServiceUpdate) -> Optional[Service]:
         """
         Update service information.
@@ -278,6 +382,7 @@ class PlatformService:
         service = await self.get_service_by_id(service_id)
         if not service:
             return None
+        self._service_cache.pop(service_id, None)
 
         # Use mapper to update entity from DTO
         updated_service = ServiceMapper.update_entity_from_dto(service, service_in)
@@ -301,10 +406,16 @@ class PlatformService:
         Returns:
             bool: True if service was deleted, False if not found
         """
-        service = await self.get_service_by_id(service_id)
-        if not service:
+        self._service_cache.pop(service_id, None)
+
+        # Delete the row and read back what cleanup needs in one round trip
+        deleted = await self.service_repository.delete_returning(service_id)
+        if deleted is None:
             return False
 
+        # Commit before the slow cleanup so the write lock isn't held while it runs
+        await self.db.commit()
+
         try:
             # Clean up resources in parallel
             cleanup_tasks = []
@@ -312,26 +423,24 @@ class PlatformService:
             # Delete Kubernetes deployment
             cleanup_tasks.append(
                 self.kubernetes_service.delete_deployment(
-                    service_name=service.name,
-                    environment=service.environment.value
+                    service_name=deleted.name,
+                    environment=deleted.environment.value
                 )
             )
 
             # Destroy Terraform infrastructure
             cleanup_tasks.append(
                 self.terraform_service.destroy_infrastructure(
-                    service_name=service.name,
-                    environment=service.environment.value
+                    service_name=deleted.name,
+                    environment=deleted.environment.value
                 )
             )
 
             # Wait for cleanup to complete
             await asyncio.gather(*cleanup_tasks, return_exceptions=True)
 
-            # Use repository to delete service
-            return await self.service_repository.delete_by_id(service_id)
-
         except Exception as e:
-            # Log error but still delete from database
+            # Log error; the service is already deleted from the database
             print(f"Error during service cleanup: {e}")
-            return await self.service_repository.delete_by_id(service_id)
+
+        return True
@@ -5,78 +5,36 @@ This service generates the complete file structure that will be included in the
 ensuring the CI/CD pipeline will work correctly.
 """
 
-from typing import Dict, Any
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Any, Iterator, Tuple, Union
 from pathlib import Path
 
-
-class RepositoryFileService:
-    """
-    Service for generating repository files.
-    
-    Generates all necessary files for a service repository including:
-    - requirements.txt and requirements-dev.txt
-    - app/ directory with main.py
-    - tests/ directory with test files
-    - k8s/ directory with manifests
-    - Dockerfile
-    - README.md
-    - .gitignore
-    """
-
-    def __init__(self):
-        """Initialize repository file service."""
-        pass
-
-    def generate_all_files(self, service_name: str, service_type: str = "api") -> Dict[str, str]:
-        """
-        Generate all files for a service repository.
-        
-        Args:
-            service_name: Name of the service
-            service_type: Type of service (api, worker, etc.)
-            
-        Returns:
-            Dictionary mapping file paths to file contents
-        """
-        files = {}
-        
-        # Generate requirements files
-        files["requirements.txt"] = self._generate_requirements_txt()
-        files["requirements-dev.txt"] = self._generate_requirements_dev_txt()
-        
-        # Generate app files
-        files["app/__init__.py"] = ""
-        files["app/main.py"] = self._generate_main_py(service_name)
-        
-        # Generate test files
-        files["tests/__init__.py"] = ""
-        files["tests/test_main.py"] = self._generate_test_main_py(service_name)
-        
-        # Generate Kubernetes files
-        files["k8s/deployment.yaml"] = self._generate_deployment_yaml(service_name)
-        files["k8s/service.yaml"] = self._generate_service_yaml(service_name)
-        
-        # Generate Dockerfile
-        files["Dockerfile"] = self._generate_dockerfile()
-        
-        # Generate README
-        files["README.md"] = self._generate_readme(service_name)
-        
-        # Generate .gitignore
-        files[".gitignore"] = self._generate_gitignore()
-        
-        return files
-
-    def _generate_requirements_txt(self) -> str:
-        """Generate requirements.txt file."""
-        return """fastapi
+# Upper bound on threads used to write a generated repository to disk
+_MAX_WRITE_WORKERS = 8
+
+# Repository paths, interned so every generated dict shares the same key objects
+_PATH_REQUIREMENTS = sys.intern("requirements.txt")
+_PATH_REQUIREMENTS_DEV = sys.intern("requirements-dev.txt")
+_PATH_APP_INIT = sys.intern("app/__init__.py")
+_PATH_MAIN_PY = sys.intern("app/main.py")
+_PATH_TESTS_INIT = sys.intern("tests/__init__.py")
+_PATH_TEST_MAIN_PY = sys.intern("tests/test_main.py")
+_PATH_DEPLOYMENT_YAML = sys.intern("k8s/deployment.yaml")
+_PATH_SERVICE_YAML = sys.intern("k8s/service.yaml")
+_PATH_DOCKERFILE = sys.intern("Dockerfile")
+_PATH_README = sys.intern("README.md")
+_PATH_GITIGNORE = sys.intern(".gitignore")
+
+# Files that don't depend on the service are built once at import time
+_REQUIREMENTS_TXT = """fastapi
 uvicorn[standard]
 pydantic
 pydantic-settings"""
 
-    def _generate_requirements_dev_txt(self) -> str:
-        """Generate requirements-dev.txt file."""
-        return """pytest==7.4.3
+_REQUIREMENTS_DEV_TXT = """pytest==7.4.3
 pytest-cov
 pytest-asyncio==0.21.1
 flake8==6.1.0
@@ -86,104 +44,7 @@ bandit
 safety
 httpx==0.25.2"""
 
-    def _generate_main_py(self, service_name: str) -> str:
-        """Generate main.py file."""
-        return f"""from fastapi import FastAPI
-
-app = FastAPI()
-
-
-@app.get("/health")
-def health():
-    return {{"status": "healthy"}}
-
-
-@app.get("/")
-def root():
-    return {{"message": "Hello from {service_name}"}}
-"""
-
-    def _generate_test_main_py(self, service_name: str) -> str:
-        """Generate test_main.py file."""
-        return f"""from fastapi.testclient import TestClient
-from app.main import app
-
-client = TestClient(app)
-
-
-def test_health_endpoint():
-    "Test the health check endpoint."
-    response = client.get("/health")
-    assert response.status_code == 200
-    assert response.json() == {{"status": "healthy"}}
-
-
-def test_root_endpoint():
-    "Test the root endpoint."
-    response = client.get("/")
-    assert response.status_code == 200
-    assert response.json() == {{"message": "Hello from {service_name}"}}
-
-
-def test_health_endpoint_returns_json():
-    "Test that health endpoint returns proper JSON content type."
-    response = client.get("/health")
-    assert response.status_code == 200
-    assert response.headers["content-type"] == "application/json"
-
-
-def test_root_endpoint_returns_json():
-    "Test that root endpoint returns proper JSON content type."
-    response = client.get("/")
-    assert response.status_code == 200
-    assert response.headers["content-type"] == "application/json"
-"""
-
-    def _generate_deployment_yaml(self, service_name: str) -> str:
-        """Generate deployment.yaml file."""
-        return f"""apiVersion: apps/v1
-kind: Deployment
-metadata:
-  name: {service_name}
-spec:
-  replicas: 1
-  selector:
-    matchLabels:
-      app: {service_name}
-  template:
-    metadata:
-      labels:
-        app: {service_name}
-    spec:
-      containers:
-      - name: {service_name}
-        image: ghcr.io/platformdavid/{service_name}:latest
-        ports:
-        - containerPort: 8000
-        livenessProbe:
-          httpGet:
-            path: /health
-            port: 8000
-          initialDelaySeconds: 30
-          periodSeconds: 10"""
-
-    def _generate_service_yaml(self, service_name: str) -> str:
-        """Generate service.yaml file."""
-        return f"""apiVersion: v1
-kind: Service
-metadata:
-  name: {service_name}
-spec:
-  selector:
-    app: {service_name}
-  ports:
-  - port: 80
-    targetPort: 8000
-  type: ClusterIP"""
-
-    def _generate_dockerfile(self) -> str:
-        """Generate Dockerfile."""
-        return """FROM python:3.11-slim
+_DOCKERFILE = """FROM python:3.11-slim
 
 WORKDIR /app
 
@@ -196,14 +57,7 @@ EXPOSE 8000
 
 CMD ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000"]"""
 
-    def _generate_readme(self, service_name: str) -> str:
-        """Generate README.md file."""
-        return f"""# {service_name}
-Service created by Platform Engineering API."""
-
-    def _generate_gitignore(self) -> str:
-        """Generate .gitignore file."""
-        return """# Byte-compiled / optimized / DLL files
+_GITIGNORE = """# Byte-compiled / optimized / DLL files
 __pycache__/
 *.py[codz]
 *$py.class
@@ -410,3 +264,287 @@ cython_debug/
 marimo/_static/
 marimo/_lsp/
 __marimo__/"""
+
+
+# Pre-encoded copies of the static files, written with Path.write_bytes
+_STATIC_FILE_BYTES = {
+    _PATH_REQUIREMENTS: _REQUIREMENTS_TXT.encode(),
+    _PATH_REQUIREMENTS_DEV: _REQUIREMENTS_DEV_TXT.encode(),
+    _PATH_APP_INIT: b"",
+    _PATH_TESTS_INIT: b"",
+    _PATH_DOCKERFILE: _DOCKERFILE.encode(),
+    _PATH_GITIGNORE: _GITIGNORE.encode(),
+}
+
+# Per-service files are templates with a placeholder token for the service name
+_SERVICE_NAME = "__SERVICE_NAME__"
+
+_MAIN_PY_TEMPLATE = """from fastapi import FastAPI
+
+app = FastAPI()
+
+
+@app.get("/health")
+def health():
+    return {"status": "healthy"}
+
+
+@app.get("/")
+def root():
+    return {"message": "Hello from __SERVICE_NAME__"}
+"""
+
+_TEST_MAIN_PY_TEMPLATE = """from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_health_endpoint():
+    "Test the health check endpoint."
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy"}
+
+
+def test_root_endpoint():
+    "Test the root endpoint."
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.json() == {"message": "Hello from __SERVICE_NAME__"}
+
+
+def test_health_endpoint_returns_json():
+    "Test that health endpoint returns proper JSON content type."
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_root_endpoint_returns_json():
+    "Test that root endpoint returns proper JSON content type."
+    response = client.get("/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+"""
+
+_DEPLOYMENT_YAML_TEMPLATE = """apiVersion: apps/v1
+kind: Deployment
+metadata:
+  name: __SERVICE_NAME__
+spec:
+  replicas: 1
+  selector:
+    matchLabels:
+      app: __SERVICE_NAME__
+  template:
+    metadata:
+      labels:
+        app: __SERVICE_NAME__
+    spec:
+      containers:
+      - name: __SERVICE_NAME__
+        image: ghcr.io/platformdavid/__SERVICE_NAME__:latest
+        ports:
+        - containerPort: 8000
+        livenessProbe:
+          httpGet:
+            path: /health
+            port: 8000
+          initialDelaySeconds: 30
+          periodSeconds: 10"""
+
+_SERVICE_YAML_TEMPLATE = """apiVersion: v1
+kind: Service
+metadata:
+  name: __SERVICE_NAME__
+spec:
+  selector:
+    app: __SERVICE_NAME__
+  ports:
+  - port: 80
+    targetPort: 8000
+  type: ClusterIP"""
+
+_README_TEMPLATE = """# __SERVICE_NAME__
+Service created by Platform Engineering API."""
+
+# Templates split around the token once, so rendering is a single str.join with the name
+_MAIN_PY_PARTS = tuple(_MAIN_PY_TEMPLATE.split(_SERVICE_NAME))
+_TEST_MAIN_PY_PARTS = tuple(_TEST_MAIN_PY_TEMPLATE.split(_SERVICE_NAME))
+_DEPLOYMENT_YAML_PARTS = tuple(_DEPLOYMENT_YAML_TEMPLATE.split(_SERVICE_NAME))
+_SERVICE_YAML_PARTS = tuple(_SERVICE_YAML_TEMPLATE.split(_SERVICE_NAME))
+_README_PARTS = tuple(_README_TEMPLATE.split(_SERVICE_NAME))
+
+
+def _write_file(path: Path, content: Union[str, bytes]) -> None:
+    """Write one file, creating its parent directories."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+
+
+class RepositoryFileService:
+    """
+    Service for generating repository files.
+    
+    Generates all necessary files for a service repository including:
+    - requirements.txt and requirements-dev.txt
+    - app/ directory with main.py
+    - tests/ directory with test files
+    - k8s/ directory with manifests
+    - Dockerfile
+    - README.md
+    - .gitignore
+    """
+
+    def __init__(self):
+        """Initialize repository file service."""
+        pass
+
+    def generate_all_files(self, service_name: str, service_type: str = "api") -> Dict[str, str]:
+        """
+        Generate all files for a service repository.
+        
+        Args:
+            service_name: Name of the service
+            service_type: Type of service (api, worker, etc.)
+            
+        Returns:
+            Dictionary mapping file paths to file contents
+        """
+        return dict(_cached_files(service_name, service_type))
+
+    def iter_all_files(self, service_name: str, service_type: str = "api") -> Iterator[Tuple[str, str]]:
+        """
+        Iterate over the files for a service repository one at a time.
+        
+        Unlike generate_all_files, no new dict is built; the pairs come straight
+        from the shared cache.
+        
+        Args:
+            service_name: Name of the service
+            service_type: Type of service (api, worker, etc.)
+            
+        Returns:
+            Iterator of (file path, file contents) pairs
+        """
+        return iter(_cached_files(service_name, service_type))
+
+    def _build_all_files(self, service_name: str, service_type: str) -> Dict[str, str]:
+        """Build the repository files; generate_all_files serves these from a cache."""
+        files = {}
+        
+        # Generate requirements files
+        files[_PATH_REQUIREMENTS] = _REQUIREMENTS_TXT
+        files[_PATH_REQUIREMENTS_DEV] = _REQUIREMENTS_DEV_TXT
+        
+        # Generate app files
+        files[_PATH_APP_INIT] = ""
+        files[_PATH_MAIN_PY] = self._generate_main_py(service_name)
+        
+        # Generate test files
+        files[_PATH_TESTS_INIT] = ""
+        files[_PATH_TEST_MAIN_PY] = self._generate_test_main_py(service_name)
+        
+        # Generate Kubernetes files
+        files[_PATH_DEPLOYMENT_YAML] = self._generate_deployment_yaml(service_name)
+        files[_PATH_SERVICE_YAML] = self._generate_service_yaml(service_name)
+        
+        # Generate Dockerfile
+        files[_PATH_DOCKERFILE] = _DOCKERFILE
+        
+        # Generate README
+        files[_PATH_README] = self._generate_readme(service_name)
+        
+        # Generate .gitignore
+        files[_PATH_GITIGNORE] = _GITIGNORE
+        
+        return files
+
+    def generate_all_files_bytes(self, service_name: str, service_type: str = "api") -> Dict[str, bytes]:
+        """
+        Generate all files for a service repository as UTF-8 bytes.
+        
+        Static files come pre-encoded; only the per-service files are encoded here.
+        
+        Args:
+            service_name: Name of the service
+            service_type: Type of service (api, worker, etc.)
+            
+        Returns:
+            Dictionary mapping file paths to encoded file contents
+        """
+        return {
+            path: _STATIC_FILE_BYTES[path] if path in _STATIC_FILE_BYTES else content.encode()
+            for path, content in self.generate_all_files(service_name, service_type).items()
+        }
+
+    def write_all_files(self, root: Path, files: Dict[str, Union[str, bytes]]) -> None:
+        """
+        Write generated files under a root directory, several at a time.
+        
+        Args:
+            root: Directory the repository is written into
+            files: Dictionary mapping file paths to file contents
+        """
+        with ThreadPoolExecutor(max_workers=_MAX_WRITE_WORKERS) as executor:
+            # Consume the iterator so write errors are raised here
+            list(executor.map(_write_file, [root / path for path in files], files.values()))
+
+    async def awrite_all_files(self, root: Path, files: Dict[str, Union[str, bytes]]) -> None:
+        """
+        Write generated files under a root directory without blocking the event loop.
+        
+        Args:
+            root: Directory the repository is written into
+            files: Dictionary mapping file paths to file contents
+        """
+        await asyncio.gather(*(
+            asyncio.to_thread(_write_file, root / path, content)
+            for path, content in files.items()
+        ))
+
+    def _generate_requirements_txt(self) -> str:
+        """Generate requirements.txt file."""
+        return _REQUIREMENTS_TXT
+
+    def _generate_requirements_dev_txt(self) -> str:
+        """Generate requirements-dev.txt file."""
+        return _REQUIREMENTS_DEV_TXT
+
+    def _generate_main_py(self, service_name: str) -> str:
+        """Generate main.py file."""
+        return service_name.join(_MAIN_PY_PARTS)
+
+    def _generate_test_main_py(self, service_name: str) -> str:
+        """Generate test_main.py file."""
+        return service_name.join(_TEST_MAIN_PY_PARTS)
+
+    def _generate_deployment_yaml(self, service_name: str) -> str:
+        """Generate deployment.yaml file."""
+        return service_name.join(_DEPLOYMENT_YAML_PARTS)
+
+    def _generate_service_yaml(self, service_name: str) -> str:
+        """Generate service.yaml file."""
+        return service_name.join(_SERVICE_YAML_PARTS)
+
+    def _generate_dockerfile(self) -> str:
+        """Generate Dockerfile."""
+        return _DOCKERFILE
+
+    def _generate_readme(self, service_name: str) -> str:
+        """Generate README.md file."""
+        return service_name.join(_README_PARTS)
+
+    def _generate_gitignore(self) -> str:
+        """Generate .gitignore file."""
+        return _GITIGNORE
+
+
+@lru_cache(maxsize=256)
+def _cached_files(service_name: str, service_type: str) -> Tuple[Tuple[str, str], ...]:
+    """Generate repository files once per (service name, service type)."""
+    return tuple(RepositoryFileService()._build_all_files(service_name, service_type).items())
@@ -5,14 +5,194 @@ This service generates Terraform configurations that create the cheapest possibl
 AWS infrastructure while still demonstrating distributed systems capabilities.
 """
 
+import asyncio
 import json
-import subprocess
 import os
-from typing import Dict, Any, List
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 from app.config import settings
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _render_tf_json(config: Dict[str, Any]) -> str:
+    """
+    Render a configuration in Terraform's JSON syntax.
+    
+    The config dicts already follow the .tf.json layout (block type, then
+    labels, then arguments), so no HCL conversion is needed.
+    """
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(config, indent=2)
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse one JSON document, with orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _write_unbuffered(path: Path, data: bytes) -> None:
+    """Write a file with raw os-level calls, skipping Python's buffered text layer."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+async def _write_file(path: Path, content: str) -> None:
+    """Write a text file without blocking the event loop."""
+    await asyncio.to_thread(_write_unbuffered, path, content.encode())
+
+
+# Use local terraform executable
+_TERRAFORM_PATH = Path(__file__).parent.parent.parent / "tools" / "terraform.exe"
+
+# Longest single -json event line accepted from Terraform
+_MAX_TERRAFORM_EVENT_BYTES = 1024 * 1024
+
+# Static parts of every generated configuration, shared rather than rebuilt per request
+_TERRAFORM_BLOCK = {
+    "required_version": ">= 1.0",
+    "required_providers": {
+        "aws": {
+            "source": "hashicorp/aws",
+            "version": "~> 5.0"
+        }
+    }
+}
+
+_COST_BREAKDOWN = {
+    "api": {
+        "ecs_fargate_spot": "$3-8/month",
+        "cloudwatch_logs": "$1-2/month",
+        "data_transfer": "$1-3/month",
+        "total": "$5-13/month",
+        "savings": "70% vs on-demand"
+    },
+    "web": {
+        "s3_storage": "$0.02-0.10/month",
+        "s3_requests": "$0.01-0.05/month",
+        "data_transfer": "$0.50-2/month",
+        "total": "$0.53-2.15/month",
+        "savings": "90% vs EC2 hosting"
+    },
+    "worker": {
+        "lambda_requests": "$0.20-1/month",
+        "lambda_duration": "$0.10-0.50/month",
+        "cloudwatch_logs": "$0.50-1/month",
+        "total": "$0.80-2.50/month",
+        "savings": "95% vs EC2 workers"
+    }
+}
+
+_DEFAULT_COST_BREAKDOWN = {
+    "total": "$5-15/month",
+    "savings": "70-90% vs standard setup"
+}
+
+
+# Fixed sub-blocks of the API resources, shared across configs rather than rebuilt
+_API_INGRESS_RULES = [
+    {
+        "description": "HTTP",
+        "from_port": 80,
+        "to_port": 80,
+        "protocol": "tcp",
+        "cidr_blocks": ["0.0.0.0/0"]
+    },
+    {
+        "description": "HTTPS",
+        "from_port": 443,
+        "to_port": 443,
+        "protocol": "tcp",
+        "cidr_blocks": ["0.0.0.0/0"]
+    },
+    {
+        "description": "API Port",
+        "from_port": 8000,
+        "to_port": 8000,
+        "protocol": "tcp",
+        "cidr_blocks": ["0.0.0.0/0"]
+    }
+]
+
+_ALLOW_ALL_EGRESS = [
+    {
+        "description": "All outbound",
+        "from_port": 0,
+        "to_port": 0,
+        "protocol": "-1",
+        "cidr_blocks": ["0.0.0.0/0"]
+    }
+]
+
+_ECS_CLUSTER_SETTINGS = [
+    {
+        "name": "containerInsights",
+        "value": "disabled"  # Disable to save costs
+    }
+]
+
+_FARGATE_SPOT_STRATEGY = [
+    {
+        "capacity_provider": "FARGATE_SPOT",  # Use spot instances for 70% cost reduction
+        "weight": 1
+    }
+]
+
+# JSON documents embedded in resources, serialized once with placeholder tokens
+_CONTAINER_DEFINITIONS_TEMPLATE = json.dumps([
+    {
+        "name": "__SVC__",
+        "image": "ghcr.io/__ORG__/__SVC__:latest",
+        "portMappings": [{"containerPort": 8000}],
+        "logConfiguration": {
+            "logDriver": "awslogs",
+            "options": {
+                "awslogs-group": "/ecs/__SVC__-__ENV__",
+                "awslogs-region": "__REGION__",
+                "awslogs-stream-prefix": "ecs"
+            }
+        },
+        "environment": [
+            {"name": "ENVIRONMENT", "value": "__ENV__"},
+            {"name": "SERVICE_NAME", "value": "__SVC__"}
+        ]
+    }
+])
+
+_S3_BUCKET_POLICY_TEMPLATE = json.dumps({
+    "Version": "2012-10-17",
+    "Statement": [
+        {
+            "Sid": "PublicReadGetObject",
+            "Effect": "Allow",
+            "Principal": "*",
+            "Action": "s3:GetObject",
+            "Resource": "${aws_s3_bucket.__SVC___bucket.arn}/*"
+        }
+    ]
+})
+
+
+def _fill_json_template(template: str, **values: str) -> str:
+    """Substitute placeholder tokens in a serialized JSON template with escaped values."""
+    for token, value in values.items():
+        encoded = orjson.dumps(value).decode() if orjson is not None else json.dumps(value)
+        template = template.replace(token, encoded[1:-1])
+    return template
+
 
 class TerraformService:
     """
@@ -30,11 +210,24 @@ class TerraformService:
     def __init__(self):
         """Initialize Terraform service with cost-optimized settings."""
         self.workspace_dir = settings.terraform_workspace_dir
+        self._workspace_path = Path(self.workspace_dir)
         self.aws_region = settings.aws_region
         self.organization = settings.platform_organization
         self.vpc_id = settings.vpc_id
         self.public_subnet_id = settings.public_subnet_id
         self.private_subnet_id = settings.private_subnet_id
+        self._aws_env = {
+            "AWS_ACCESS_KEY_ID": settings.aws_access_key_id,
+            "AWS_SECRET_ACCESS_KEY": settings.aws_secret_access_key,
+            "AWS_REGION": settings.aws_region
+        }
+        self._resource_builders = {
+            "api": self._generate_cost_optimized_api_resources,
+            "web": self._generate_cost_optimized_web_resources,
+            "worker": self._generate_cost_optimized_worker_resources
+        }
+        # Built on first Terraform run; the process environment doesn't change afterwards
+        self._terraform_env: Optional[Dict[str, str]] = None
 
     async def create_infrastructure(self, service_name: str, service_type: str, environment: str) -> Dict[str, Any]:
         """
@@ -47,7 +240,7 @@ class TerraformService:
             terraform_config = self._generate_cost_optimized_config(service_name, service_type, environment)
             
             # Write Terraform files
-            self._write_terraform_files(service_name, terraform_config)
+            await self._write_terraform_files(service_name, terraform_config)
             
             # Run Terraform apply
             result = await self._run_terraform(service_name, "apply")
@@ -95,15 +288,7 @@ class TerraformService:
         """Generate cost-optimized Terraform configuration."""
         
         config = {
-            "terraform": {
-                "required_version": ">= 1.0",
-                "required_providers": {
-                    "aws": {
-                        "source": "hashicorp/aws",
-                        "version": "~> 5.0"
-                    }
-                }
-            },
+            "terraform": _TERRAFORM_BLOCK,
             "provider": {
                 "aws": {
                     "region": self.aws_region,
@@ -127,12 +312,9 @@ class TerraformService:
             }
         }
 
-        if service_type == "api":
-            config["resource"] = self._generate_cost_optimized_api_resources(service_name, environment)
-        elif service_type == "web":
-            config["resource"] = self._generate_cost_optimized_web_resources(service_name, environment)
-        elif service_type == "worker":
-            config["resource"] = self._generate_cost_optimized_worker_resources(service_name, environment)
+        builder = self._resource_builders.get(service_type)
+        if builder is not None:
+            config["resource"] = builder(service_name, environment)
 
         return config
 
@@ -144,38 +326,8 @@ class TerraformService:
                     "name": f"{service_name}-{environment}-sg",
                     "description": f"Security group for {service_name} {environment}",
                     "vpc_id": self.vpc_id,
-                    "ingress": [
-                        {
-                            "description": "HTTP",
-                            "from_port": 80,
-                            "to_port": 80,
-                            "protocol": "tcp",
-                            "cidr_blocks": ["0.0.0.0/0"]
-                        },
-                        {
-                            "description": "HTTPS",
-                            "from_port": 443,
-                            "to_port": 443,
-                            "protocol": "tcp",
-                            "cidr_blocks": ["0.0.0.0/0"]
-                        },
-                        {
-                            "description": "API Port",
-                            "from_port": 8000,
-                            "to_port": 8000,
-                            "protocol": "tcp",
-                            "cidr_blocks": ["0.0.0.0/0"]
-                        }
-                    ],
-                    "egress": [
-                        {
-                            "description": "All outbound",
-                            "from_port": 0,
-                            "to_port": 0,
-                            "protocol": "-1",
-                            "cidr_blocks": ["0.0.0.0/0"]
-                        }
-                    ],
+                    "ingress": _API_INGRESS_RULES,
+                    "egress": _ALLOW_ALL_EGRESS,
                     "tags": "${local.tags}"
                 }
             },
@@ -183,12 +335,7 @@ class TerraformService:
                 f"{service_name}_cluster": {
                     "name": f"{service_name}-{environment}",
                     "tags": "${local.tags}",
-                    "setting": [
-                        {
-                            "name": "containerInsights",
-                            "value": "disabled"  # Disable to save costs
-                        }
-                    ]
+                    "setting": _ECS_CLUSTER_SETTINGS
                 }
             },
             "aws_ecs_task_definition": {
@@ -199,25 +346,13 @@ class TerraformService:
                     "cpu": "256",  # Minimum CPU (0.25 vCPU)
                     "memory": "512",  # Minimum memory (0.5 GB)
                     "execution_role_arn": "arn:aws:iam::aws:policy/service-role/AmazonECSTaskExecutionRolePolicy",
-                    "container_definitions": json.dumps([
-                        {
-                            "name": service_name,
-                            "image": f"ghcr.io/{self.organization}/{service_name}:latest",
-                            "portMappings": [{"containerPort": 8000}],
-                            "logConfiguration": {
-                                "logDriver": "awslogs",
-                                "options": {
-                                    "awslogs-group": f"/ecs/{service_name}-{environment}",
-                                    "awslogs-region": self.aws_region,
-                                    "awslogs-stream-prefix": "ecs"
-                                }
-                            },
-                            "environment": [
-                                {"name": "ENVIRONMENT", "value": environment},
-                                {"name": "SERVICE_NAME", "value": service_name}
-                            ]
-                        }
-                    ]),
+                    "container_definitions": _fill_json_template(
+                        _CONTAINER_DEFINITIONS_TEMPLATE,
+                        __SVC__=service_name,
+                        __ENV__=environment,
+                        __ORG__=self.organization,
+                        __REGION__=self.aws_region
+                    ),
                     "tags": "${local.tags}"
                 }
             },
@@ -228,12 +363,7 @@ class TerraformService:
                     "task_definition": f"${{aws_ecs_task_definition.{service_name}_task.arn}}",
                     "desired_count": 1,  # Start with 1 replica (can scale up)
                     "launch_type": "FARGATE",
-                    "capacity_provider_strategy": [
-                        {
-                            "capacity_provider": "FARGATE_SPOT",  # Use spot instances for 70% cost reduction
-                            "weight": 1
-                        }
-                    ],
+                    "capacity_provider_strategy": _FARGATE_SPOT_STRATEGY,
                     "network_configuration": {
                         "subnets": [self.public_subnet_id],  # Use configured public subnet
                         "security_groups": [f"${{aws_security_group.{service_name}_sg.id}}"],  # Reference security group
@@ -283,18 +413,7 @@ class TerraformService:
             "aws_s3_bucket_policy": {
                 f"{service_name}_policy": {
                     "bucket": f"${{aws_s3_bucket.{service_name}_bucket.id}}",
-                    "policy": json.dumps({
-                        "Version": "2012-10-17",
-                        "Statement": [
-                            {
-                                "Sid": "PublicReadGetObject",
-                                "Effect": "Allow",
-                                "Principal": "*",
-                                "Action": "s3:GetObject",
-                                "Resource": f"${{aws_s3_bucket.{service_name}_bucket.arn}}/*"
-                            }
-                        ]
-                    })
+                    "policy": _fill_json_template(_S3_BUCKET_POLICY_TEMPLATE, __SVC__=service_name)
                 }
             }
         }
@@ -329,17 +448,21 @@ class TerraformService:
             }
         }
 
-    def _write_terraform_files(self, service_name: str, config: Dict[str, Any]) -> None:
+    @lru_cache(maxsize=128)
+    def _service_dir(self, service_name: str) -> Path:
+        """Get a service's Terraform working directory."""
+        return self._workspace_path / service_name
+
+    async def _write_terraform_files(self, service_name: str, config: Dict[str, Any]) -> None:
         """Write Terraform configuration files."""
-        service_dir = Path(self.workspace_dir) / service_name
-        service_dir.mkdir(parents=True, exist_ok=True)
+        service_dir = self._service_dir(service_name)
+        await asyncio.to_thread(service_dir.mkdir, parents=True, exist_ok=True)
 
-        # Write main.tf
-        main_tf = self._dict_to_hcl(config)
-        with open(service_dir / "main.tf", "w") as f:
-            f.write(main_tf)
+        # main.tf.json; drop any main.tf left by older runs so resources aren't declared twice
+        main_tf_json = _render_tf_json(config)
+        await asyncio.to_thread((service_dir / "main.tf").unlink, missing_ok=True)
 
-        # Write variables.tf
+        # variables.tf
         variables_tf = f"""
 variable "environment" {{
   description = "Environment name"
@@ -371,10 +494,8 @@ variable "private_subnet_id" {{
   default     = "{self.private_subnet_id}"
 }}
 """
-        with open(service_dir / "variables.tf", "w") as f:
-            f.write(variables_tf)
 
-        # Write outputs.tf
+        # outputs.tf
         outputs_tf = f"""
 output "service_url" {{
   description = "Service URL"
@@ -391,42 +512,17 @@ output "cost_optimization" {{
   value       = "Spot instances, minimal resources, serverless where possible"
 }}
 """
-        with open(service_dir / "outputs.tf", "w") as f:
-            f.write(outputs_tf)
-
-    def _dict_to_hcl(self, data: Dict[str, Any]) -> str:
-        """Convert dictionary to HCL format."""
-        def _convert_value(value, indent=0):
-            if isinstance(value, dict):
-                items = []
-                for k, v in value.items():
-                    if isinstance(v, dict):
-                        items.append(f"{'  ' * indent}{k} {{\n{_convert_value(v, indent + 1)}\n{'  ' * indent}}}")
-                    elif isinstance(v, list):
-                        items.append(f"{'  ' * indent}{k} = {_convert_value(v, indent)}")
-                    elif isinstance(v, str) and v.startswith("${{"):
-                        items.append(f"{'  ' * indent}{k} = {v}")
-                    else:
-                        items.append(f"{'  ' * indent}{k} = {json.dumps(v)}")
-                return "\n".join(items)
-            elif isinstance(value, list):
-                return "[" + ", ".join(json.dumps(v) for v in value) + "]"
-            else:
-                return json.dumps(value)
-        
-        hcl_parts = []
-        for resource_type, resources in data.items():
-            for resource_name, resource_config in resources.items():
-                hcl_parts.append(f'{resource_type} "{resource_name}" {{\n{_convert_value(resource_config, 1)}\n}}')
-        
-        return "\n\n".join(hcl_parts)
+
+        await asyncio.gather(
+            _write_file(service_dir / "main.tf.json", main_tf_json),
+            _write_file(service_dir / "variables.tf", variables_tf),
+            _write_file(service_dir / "outputs.tf", outputs_tf),
+        )
 
     async def _run_terraform(self, service_name: str, command: str) -> Dict[str, Any]:
         """Run Terraform command."""
-        service_dir = Path(self.workspace_dir) / service_name
-        
-        # Use local terraform executable
-        terraform_path = Path(__file__).parent.parent.parent / "tools" / "terraform.exe"
+        service_dir = self._service_dir(service_name)
+        terraform_path = _TERRAFORM_PATH
         
         try:
             # Set environment variables
@@ -434,38 +530,43 @@ output "cost_optimization" {{
             
             # Run terraform init
             if command == "apply":
-                init_result = subprocess.run(
-                    [str(terraform_path), "init"],
-                    cwd=service_dir,
-                    env=env,
-                    capture_output=True,
-                    text=True
-                )
-                if init_result.returncode != 0:
+                returncode, _, stderr = await self._exec_terraform(terraform_path, service_dir, env, "init")
+                if returncode != 0:
                     return {
                         "status": "error",
-                        "error": f"Terraform init failed: {init_result.stderr}"
+                        "error": f"Terraform init failed: {stderr}"
                     }
 
             # Run terraform command
-            result = subprocess.run(
-                [str(terraform_path), command, "-auto-approve"],
-                cwd=service_dir,
-                env=env,
-                capture_output=True,
-                text=True
+            if command == "apply":
+                # Stream -json events so only the outputs survive, not the whole plan
+                returncode, outputs, stderr = await self._exec_terraform_json(
+                    terraform_path, service_dir, env, command, "-json", "-auto-approve"
+                )
+                if returncode == 0:
+                    return {
+                        "status": "success",
+                        "outputs": outputs or self._parse_terraform_output("")
+                    }
+                return {
+                    "status": "error",
+                    "error": stderr
+                }
+
+            returncode, stdout, stderr = await self._exec_terraform(
+                terraform_path, service_dir, env, command, "-auto-approve"
             )
 
-            if result.returncode == 0:
+            if returncode == 0:
                 return {
                     "status": "success",
-                    "output": result.stdout,
-                    "outputs": self._parse_terraform_output(result.stdout)
+                    "output": stdout,
+                    "outputs": self._parse_terraform_output(stdout)
                 }
             else:
                 return {
                     "status": "error",
-                    "error": result.stderr
+                    "error": stderr
                 }
 
         except Exception as e:
@@ -474,15 +575,71 @@ output "cost_optimization" {{
                 "error": str(e)
             }
 
+    async def _exec_terraform(
+        self, terraform_path: Path, service_dir: Path, env: Dict[str, str], *args: str
+    ) -> Tuple[int, str, str]:
+        """
+        Run a Terraform subcommand without blocking the event loop.
+        
+        Returns:
+            Tuple of (return code, stdout, stderr)
+        """
+        process = await asyncio.create_subprocess_exec(
+            str(terraform_path), *args,
+            cwd=str(service_dir),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout.decode(), stderr.decode()
+
+    async def _exec_terraform_json(
+        self, terraform_path: Path, service_dir: Path, env: Dict[str, str], *args: str
+    ) -> Tuple[int, Dict[str, Any], str]:
+        """
+        Run a Terraform subcommand with -json, parsing its event stream line by line.
+        
+        Returns:
+            Tuple of (return code, output values from the last outputs event, error text)
+        """
+        process = await asyncio.create_subprocess_exec(
+            str(terraform_path), *args,
+            cwd=str(service_dir),
+            env=env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=_MAX_TERRAFORM_EVENT_BYTES
+        )
+        outputs: Dict[str, Any] = {}
+        errors: List[str] = []
+        
+        async def read_events() -> None:
+            async for line in process.stdout:
+                try:
+                    event = _json_loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                if event.get("type") == "outputs":
+                    outputs.clear()
+                    outputs.update(
+                        (name, output.get("value"))
+                        for name, output in event.get("outputs", {}).items()
+                    )
+                elif event.get("type") == "diagnostic" and event.get("@level") == "error":
+                    errors.append(event.get("@message", ""))
+        
+        _, stderr = await asyncio.gather(read_events(), process.stderr.read())
+        await process.wait()
+        return process.returncode, outputs, "\n".join(errors) or stderr.decode()
+
     def _get_terraform_env(self) -> Dict[str, str]:
         """Get environment variables for Terraform."""
-        env = os.environ.copy()
-        env.update({
-            "AWS_ACCESS_KEY_ID": settings.aws_access_key_id,
-            "AWS_SECRET_ACCESS_KEY": settings.aws_secret_access_key,
-            "AWS_REGION": settings.aws_region
-        })
-        return env
+        if self._terraform_env is None:
+            self._terraform_env = {**os.environ, **self._aws_env}
+        return self._terraform_env
 
     def _parse_terraform_output(self, output: str) -> Dict[str, Any]:
         """Parse Terraform output (simplified)."""
@@ -495,33 +652,10 @@ output "cost_optimization" {{
 
     def _get_cost_breakdown(self, service_type: str) -> Dict[str, Any]:
         """Get estimated monthly cost breakdown."""
-        
-        if service_type == "api":
-            return {
-                "ecs_fargate_spot": "$3-8/month",
-                "cloudwatch_logs": "$1-2/month",
-                "data_transfer": "$1-3/month",
-                "total": "$5-13/month",
-                "savings": "70% vs on-demand"
-            }
-        elif service_type == "web":
-            return {
-                "s3_storage": "$0.02-0.10/month",
-                "s3_requests": "$0.01-0.05/month",
-                "data_transfer": "$0.50-2/month",
-                "total": "$0.53-2.15/month",
-                "savings": "90% vs EC2 hosting"
-            }
-        elif service_type == "worker":
-            return {
-                "lambda_requests": "$0.20-1/month",
-                "lambda_duration": "$0.10-0.50/month",
-                "cloudwatch_logs": "$0.50-1/month",
-                "total": "$0.80-2.50/month",
-                "savings": "95% vs EC2 workers"
-            }
-        
-        return {
-            "total": "$5-15/month",
-            "savings": "70-90% vs standard setup"
-        }
+        return dict(_COST_BREAKDOWN.get(service_type, _DEFAULT_COST_BREAKDOWN))
+
+
+@lru_cache(maxsize=1)
+def get_terraform_service() -> TerraformService:
+    """Get the process-wide TerraformService, created on first use."""
+    return TerraformService()
@@ -2,81 +2,186 @@
 """
 Script to clean up test repositories.
 """
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
 import httpx
 import asyncio
+from pathlib import Path
 from app.config import settings
 
-async def list_repositories():
-    """List all repositories in the organization."""
-    headers = {
-        "Authorization": f"token {settings.github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"https://api.github.com/orgs/{settings.github_organization}/repos",
-            headers=headers
+# Keep concurrent requests under GitHub's secondary rate limits
+MAX_CONCURRENT_REQUESTS = 10
+
+# Retries for rate-limited (403/429) and server-error (5xx) responses
+MAX_RETRIES = 5
+
+# Pause until the rate-limit window resets once fewer requests than this remain
+RATE_LIMIT_FLOOR = 5
+
+# GitHub's maximum page size for repository listings
+REPOS_PER_PAGE = 100
+
+# Test repositories are recognised by this name prefix
+TEST_REPO_PREFIX = "platform-test-"
+
+# Repositories never deleted by the cleanup
+PRESERVE_REPOS = frozenset({
+    "platform-engineering-api",  # Main platform API
+    "platform-test-v15",         # Latest successful test
+})
+
+# Where the last repository listing and its ETag are kept between runs
+CACHE_DIR = Path.home() / ".cache" / "platform_cleanup"
+
+def create_client():
+    """Create one GitHub client whose connection pool is shared by every request."""
+    return httpx.AsyncClient(
+        base_url="https://api.github.com",
+        headers={
+            "Authorization": f"token {settings.github_token}",
+            "Accept": "application/vnd.github.v3+json"
+        },
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENT_REQUESTS,
+            max_keepalive_connections=MAX_CONCURRENT_REQUESTS
         )
+    )
+
+_request_slots = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+async def _req(client, method, url, **kwargs):
+    """Send a GitHub request, pacing on rate-limit headers and retrying with backoff."""
+    for attempt in range(MAX_RETRIES + 1):
+        async with _request_slots:
+            response = await client.request(method, url, **kwargs)
         
-        if response.status_code == 200:
-            repos = response.json()
-            print(f"📋 Found {len(repos)} repositories:")
-            print("-" * 60)
-            
-            for i, repo in enumerate(repos, 1):
-                print(f"{i:2d}. {repo['name']:<30} | Created: {repo['created_at'][:10]} | Private: {repo['private']}")
-            
-            return repos
+        if attempt == MAX_RETRIES:
+            return response
+        
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and int(remaining) < RATE_LIMIT_FLOOR:
+            delay = int(response.headers.get("X-RateLimit-Reset", 0)) - time.time()
+            if delay > 0:
+                print(f"⏳ Rate limit nearly exhausted, waiting {delay:.0f}s for reset")
+                await asyncio.sleep(delay)
+            if remaining == "0" and response.status_code in (403, 429):
+                continue
+        
+        if response.status_code in (403, 429) and "Retry-After" in response.headers:
+            await asyncio.sleep(int(response.headers["Retry-After"]))
+        elif response.status_code >= 500:
+            await asyncio.sleep(min(60, 2 ** attempt) + random.random())
         else:
+            return response
+    
+    return response
+
+def _listing_cache_path():
+    """Cache file for the repository listing, keyed on org and token so rotation starts fresh."""
+    key = hashlib.sha256(f"{settings.github_organization}:{settings.github_token}".encode()).hexdigest()[:16]
+    return CACHE_DIR / f"orgs_repos_{key}.json"
+
+def _load_cached_listing(path):
+    """Load a cached {"etag", "body"} listing, or None if it is missing or unreadable."""
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+def _last_page(response):
+    """Read the last page number from a paginated response's Link header."""
+    last = response.links.get("last")
+    if not last:
+        return 1
+    return int(httpx.URL(last["url"]).params.get("page", 1))
+
+async def list_repositories(client):
+    """List all repositories in the organization."""
+    url = f"/orgs/{settings.github_organization}/repos"
+    cache_path = _listing_cache_path()
+    cached = _load_cached_listing(cache_path)
+    
+    # Conditional request for the first page: a 304 doesn't count against the rate limit.
+    # Repos are listed newest first, so an unchanged first page means no new repos.
+    headers = {"If-None-Match": cached["etag"]} if cached else {}
+    response = await _req(client, "GET", url, params={"per_page": REPOS_PER_PAGE, "page": 1}, headers=headers)
+    
+    if response.status_code == 304 and cached:
+        first_page, last_page = cached["body"], cached.get("last_page", 1)
+    elif response.status_code == 200:
+        first_page, last_page = response.json(), _last_page(response)
+        if "ETag" in response.headers:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_text(json.dumps({
+                "etag": response.headers["ETag"],
+                "body": first_page,
+                "last_page": last_page
+            }))
+    else:
+        print(f"❌ Error: {response.status_code}")
+        return []
+    
+    # Fetch the remaining pages concurrently
+    responses = await asyncio.gather(*(
+        _req(client, "GET", url, params={"per_page": REPOS_PER_PAGE, "page": page})
+        for page in range(2, last_page + 1)
+    ))
+    for response in responses:
+        if response.status_code != 200:
             print(f"❌ Error: {response.status_code}")
             return []
+    
+    repos = [repo for page in (first_page, *(r.json() for r in responses)) for repo in page]
+    print(f"📋 Found {len(repos)} repositories:")
+    print("-" * 60)
+    
+    # One write for the whole listing rather than a print per repo
+    sys.stdout.write("".join(
+        f"{i:2d}. {repo['name']:<30} | Created: {repo['created_at'][:10]} | Private: {repo['private']}\n"
+        for i, repo in enumerate(repos, 1)
+    ))
+    
+    return repos
 
-async def delete_repository(repo_name):
+async def delete_repository(client, repo_name):
     """Delete a specific repository."""
-    headers = {
-        "Authorization": f"token {settings.github_token}",
-        "Accept": "application/vnd.github.v3+json"
-    }
-    
-    async with httpx.AsyncClient() as client:
-        response = await client.delete(
-            f"https://api.github.com/repos/{settings.github_organization}/{repo_name}",
-            headers=headers
-        )
-        
-        if response.status_code == 204:
-            print(f"✅ Deleted {repo_name}")
-            return True
-        else:
-            print(f"❌ Failed to delete {repo_name}: {response.status_code}")
-            return False
+    response = await _req(client, "DELETE", f"/repos/{settings.github_organization}/{repo_name}")
+    
+    if response.status_code == 204:
+        print(f"✅ Deleted {repo_name}")
+        return True
+    else:
+        print(f"❌ Failed to delete {repo_name}: {response.status_code}")
+        return False
+
+async def cleanup_test_repos(yes=False):
+    """Clean up test repositories; yes=True skips the confirmation prompt."""
+    async with create_client() as client:
+        await _cleanup_test_repos(client, yes)
 
-async def cleanup_test_repos():
-    """Clean up test repositories."""
-    repos = await list_repositories()
+async def _cleanup_test_repos(client, yes):
+    """Clean up test repositories using a shared client."""
+    repos = await list_repositories(client)
     
     if not repos:
         return
     
-    # Filter test repositories but preserve important ones
-    test_repos = [repo for repo in repos if repo['name'].startswith('platform-test-')]
-    
-    # Define repositories to preserve
-    preserve_repos = [
-        'platform-engineering-api',  # Main platform API
-        'platform-test-v15',         # Latest successful test
-    ]
-    
-    # Filter out repositories to preserve
+    # Split test repositories into delete/preserve in one pass
     repos_to_delete = []
     repos_to_preserve = []
     
-    for repo in test_repos:
-        if repo['name'] in preserve_repos:
-            repos_to_preserve.append(repo['name'])
+    for repo in repos:
+        name = repo['name']
+        if not name.startswith(TEST_REPO_PREFIX):
+            continue
+        if name in PRESERVE_REPOS:
+            repos_to_preserve.append(name)
         else:
-            repos_to_delete.append(repo['name'])
+            repos_to_delete.append(name)
     
     if not repos_to_delete:
         print("No test repositories to delete.")
@@ -90,20 +195,33 @@ async def cleanup_test_repos():
     for repo in repos_to_delete:
         print(f"  🗑️  {repo}")
     
-    # Ask for confirmation
-    response = input(f"\n❓ Delete all {len(repos_to_delete)} test repositories? (y/N): ")
+    # Ask for confirmation off the event loop, unless --yes was given
+    if not yes:
+        prompt = f"\n❓ Delete all {len(repos_to_delete)} test repositories? (y/N): "
+        yes = (await asyncio.to_thread(input, prompt)).lower() == 'y'
     
-    if response.lower() == 'y':
+    if yes:
         print("\n🗑️ Deleting repositories...")
-        deleted_count = 0
-        
-        for repo in repos_to_delete:
-            if await delete_repository(repo):
-                deleted_count += 1
+        # Deletes are independent, so run them concurrently; _req caps how many are in flight
+        results = await asyncio.gather(
+            *(delete_repository(client, repo) for repo in repos_to_delete),
+            return_exceptions=True
+        )
+        deleted_count = sum(1 for result in results if result is True)
         
         print(f"\n✅ Successfully deleted {deleted_count}/{len(repos_to_delete)} repositories.")
     else:
         print("❌ Cleanup cancelled.")
 
 if __name__ == "__main__":
-    asyncio.run(cleanup_test_repos())
+    parser = argparse.ArgumentParser(description="Clean up test repositories.")
+    parser.add_argument("-y", "--yes", action="store_true", help="delete without asking for confirmation")
+    args = parser.parse_args()
+    
+    # Prefer the libuv-based event loop (shipped with uvicorn[standard]) when available
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
+    run(cleanup_test_repos(yes=args.yes))
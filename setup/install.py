@@ -9,8 +9,48 @@ It handles compatibility issues and provides comprehensive error reporting.
 import subprocess
 import sys
 import os
+from importlib import metadata
 from typing import List, Dict, Tuple
 
+CORE_PACKAGES = ["fastapi", "uvicorn[standard]", "pydantic"]
+
+ADDITIONAL_PACKAGES = [
+    "pydantic-settings",
+    "structlog==23.2.0"
+]
+
+TESTING_PACKAGES = [
+    "pytest==7.4.3",
+    "pytest-asyncio==0.21.1",
+    "httpx==0.25.2"
+]
+
+QUALITY_PACKAGES = [
+    "black==23.12.1",
+    "flake8==6.1.0",
+    "isort==5.12.0",
+    "mypy==1.7.1"
+]
+
+UTILITY_PACKAGES = [
+    "python-dotenv==1.0.0"
+]
+
+PLATFORM_PACKAGES = [
+    "pyyaml==6.0.1",
+    "boto3==1.34.0",
+    "botocore==1.34.0",
+    "kubernetes==28.1.0",
+    "PyGithub==1.59.1"
+]
+
+SERVER_PACKAGES = ["gunicorn==21.2.0"]
+
+ALL_PACKAGES = (
+    CORE_PACKAGES + ADDITIONAL_PACKAGES + TESTING_PACKAGES + QUALITY_PACKAGES
+    + UTILITY_PACKAGES + PLATFORM_PACKAGES + SERVER_PACKAGES
+)
+
 def run_command(command: List[str], description: str) -> bool:
     """Run a command and return success status."""
     print(f"\n🔄 {description}...")
@@ -25,53 +65,36 @@ def run_command(command: List[str], description: str) -> bool:
         print(f"Error: {e.stderr}")
         return False
 
-def install_package(package: str, description: str = None) -> bool:
-    """Install a single package."""
-    if description is None:
-        description = f"Installing {package}"
-    
-    return run_command([sys.executable, "-m", "pip", "install", package], description)
-
-def install_packages(packages: List[str], description: str) -> bool:
-    """Install multiple packages."""
-    return run_command([sys.executable, "-m", "pip", "install"] + packages, description)
-
-def install_with_binary_flag(packages: List[str], description: str) -> bool:
-    """Install packages with --only-binary=all flag."""
-    return run_command([sys.executable, "-m", "pip", "install", "--only-binary=all"] + packages, description)
-
 def verify_installation() -> Tuple[bool, Dict[str, str]]:
     """Verify that all packages are installed correctly."""
     print("\n✅ Verifying installation...")
     
+    # (module name, distribution name, display name); versions come from the
+    # installed metadata, so nothing has to be imported
     verification_packages = [
-        ("fastapi", "FastAPI"),
-        ("pydantic", "Pydantic"),
-        ("boto3", "Boto3"),
-        ("yaml", "PyYAML"),
-        ("kubernetes", "Kubernetes"),
-        ("github", "PyGithub"),
-        ("uvicorn", "Uvicorn"),
-        ("pydantic_settings", "Pydantic Settings"),
-        ("structlog", "Structlog"),
+        ("fastapi", "fastapi", "FastAPI"),
+        ("pydantic", "pydantic", "Pydantic"),
+        ("boto3", "boto3", "Boto3"),
+        ("yaml", "PyYAML", "PyYAML"),
+        ("kubernetes", "kubernetes", "Kubernetes"),
+        ("github", "PyGithub", "PyGithub"),
+        ("uvicorn", "uvicorn", "Uvicorn"),
+        ("pydantic_settings", "pydantic-settings", "Pydantic Settings"),
+        ("structlog", "structlog", "Structlog"),
     ]
     
     results = {}
     all_good = True
     
-    for module_name, display_name in verification_packages:
+    for module_name, dist_name, display_name in verification_packages:
         try:
-            module = __import__(module_name)
-            version = getattr(module, '__version__', 'unknown')
-            print(f"✅ {display_name} imported successfully (v{version})")
-            results[module_name] = version
-        except ImportError as e:
-            print(f"❌ {display_name} import failed: {e}")
+            installed_version = metadata.version(dist_name)
+            print(f"✅ {display_name} installed (v{installed_version})")
+            results[module_name] = installed_version
+        except metadata.PackageNotFoundError:
+            print(f"❌ {display_name} is not installed")
             results[module_name] = "FAILED"
             all_good = False
-        except Exception as e:
-            print(f"⚠️  {display_name} import had issues: {e}")
-            results[module_name] = "ISSUES"
     
     return all_good, results
 
@@ -86,75 +109,17 @@ def main():
     print("\n📦 Step 1: Upgrading pip...")
     run_command([sys.executable, "-m", "pip", "install", "--upgrade", "pip"], "Upgrading pip")
     
-    # Step 2: Clean up any existing incompatible installations
-    print("\n🧹 Step 2: Cleaning up existing installations...")
-    cleanup_packages = ["pydantic", "pydantic-core", "pydantic-settings", "fastapi", "uvicorn"]
-    run_command([sys.executable, "-m", "pip", "uninstall"] + cleanup_packages + ["-y"], 
-                "Removing existing packages")
-    
-    # Step 3: Install core FastAPI packages with binary flag
-    print("\n🔧 Step 3: Installing core FastAPI packages...")
-    core_packages = ["fastapi", "uvicorn[standard]", "pydantic"]
-    
-    if not install_with_binary_flag(core_packages, "Installing core FastAPI packages"):
-        print("❌ Core packages installation failed. Stopping.")
+    # Step 2: Install everything in one resolver run. --upgrade replaces any
+    # incompatible pydantic/fastapi already present, so no separate uninstall is needed.
+    print("\n🔧 Step 2: Installing all packages...")
+    if not run_command(
+        [sys.executable, "-m", "pip", "install", "--upgrade", "--prefer-binary", "--no-compile"] + ALL_PACKAGES,
+        "Installing all packages"
+    ):
+        print("❌ Package installation failed. Stopping.")
         return False
     
-    # Step 4: Install additional packages
-    print("\n📝 Step 4: Installing additional packages...")
-    additional_packages = [
-        "pydantic-settings",
-        "structlog==23.2.0"
-    ]
-    
-    install_packages(additional_packages, "Installing additional packages")
-    
-    # Step 5: Install testing packages
-    print("\n🧪 Step 5: Installing testing packages...")
-    testing_packages = [
-        "pytest==7.4.3",
-        "pytest-asyncio==0.21.1",
-        "httpx==0.25.2"
-    ]
-    
-    install_packages(testing_packages, "Installing testing packages")
-    
-    # Step 6: Install code quality packages
-    print("\n🎨 Step 6: Installing code quality packages...")
-    quality_packages = [
-        "black==23.12.1",
-        "flake8==6.1.0",
-        "isort==5.12.0",
-        "mypy==1.7.1"
-    ]
-    
-    install_packages(quality_packages, "Installing code quality packages")
-    
-    # Step 7: Install utility packages
-    print("\n🔧 Step 7: Installing utility packages...")
-    utility_packages = [
-        "python-dotenv==1.0.0"
-    ]
-    
-    install_packages(utility_packages, "Installing utility packages")
-    
-    # Step 8: Install platform engineering tools
-    print("\n⚙️  Step 8: Installing platform engineering tools...")
-    platform_packages = [
-        "pyyaml==6.0.1",
-        "boto3==1.34.0",
-        "botocore==1.34.0",
-        "kubernetes==28.1.0",
-        "PyGithub==1.59.1"
-    ]
-    
-    install_packages(platform_packages, "Installing platform engineering tools")
-    
-    # Step 9: Install production server
-    print("\n🚀 Step 9: Installing production server...")
-    install_package("gunicorn==21.2.0", "Installing Gunicorn")
-    
-    # Step 10: Verify installation
+    # Step 3: Verify installation
     all_good, versions = verify_installation()
     
     # Final status
@@ -21,10 +21,140 @@ os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///./platform_engineering.db"
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import AsyncSessionLocal, init_db
-from app.models.service import Service, ServiceType, Environment, ServiceStatus
+from app.models.service import ServiceType, Environment, ServiceStatus
+from app.repositories.service_repository import ServiceRepository
 from app.schemas.service import ServiceTemplate
 
 
+# Built and validated once at import
+SERVICE_TEMPLATES = (
+    ServiceTemplate(
+        name="fastapi-api",
+        description="FastAPI REST API service with comprehensive testing",
+        service_type=ServiceType.API,
+        default_configuration={
+            "framework": "fastapi",
+            "port": 8000,
+            "health_check": "/health",
+            "enable_linting": True,
+            "enable_formatting": True,
+            "enable_unit_tests": True,
+            "enable_integration_tests": True,
+            "enable_sonarqube": True,
+            "enable_security_scan": True,
+            "enable_smoke_tests": True,
+            "enable_health_check": True
+        },
+        default_infrastructure_config={
+            "cpu": "500m",
+            "memory": "512Mi",
+            "replicas": 3,
+            "autoscaling": True,
+            "min_replicas": 2,
+            "max_replicas": 10
+        },
+        default_monitoring_config={
+            "metrics": ["http_requests", "response_time", "error_rate"],
+            "alerts": ["high_error_rate", "high_latency", "service_down"],
+            "dashboard": "api-service-dashboard"
+        },
+        tags=["api", "fastapi", "rest", "python"]
+    ),
+    ServiceTemplate(
+        name="react-web",
+        description="React web application with modern tooling",
+        service_type=ServiceType.WEB,
+        default_configuration={
+            "framework": "react",
+            "build_command": "npm run build",
+            "serve_command": "npm start",
+            "enable_linting": True,
+            "enable_formatting": True,
+            "enable_unit_tests": True,
+            "enable_sonarqube": True,
+            "enable_smoke_tests": True,
+            "enable_health_check": True,
+            "enable_visual_tests": False
+        },
+        default_infrastructure_config={
+            "cpu": "250m",
+            "memory": "256Mi",
+            "replicas": 2,
+            "static_serving": True,
+            "cdn_enabled": True
+        },
+        default_monitoring_config={
+            "metrics": ["page_load_time", "user_interactions", "error_rate"],
+            "alerts": ["high_load_time", "high_error_rate"],
+            "dashboard": "web-service-dashboard"
+        },
+        tags=["web", "react", "frontend", "javascript"]
+    ),
+    ServiceTemplate(
+        name="celery-worker",
+        description="Celery background worker for async tasks",
+        service_type=ServiceType.WORKER,
+        default_configuration={
+            "framework": "celery",
+            "broker": "redis",
+            "concurrency": 4,
+            "enable_linting": True,
+            "enable_formatting": True,
+            "enable_unit_tests": True,
+            "enable_sonarqube": True,
+            "enable_security_scan": True,
+            "enable_smoke_tests": True
+        },
+        default_infrastructure_config={
+            "cpu": "1000m",
+            "memory": "1Gi",
+            "replicas": 2,
+            "autoscaling": True,
+            "min_replicas": 1,
+            "max_replicas": 5
+        },
+        default_monitoring_config={
+            "metrics": ["task_queue_length", "task_processing_time", "worker_health"],
+            "alerts": ["queue_backlog", "worker_failures", "high_processing_time"],
+            "dashboard": "worker-service-dashboard"
+        },
+        tags=["worker", "celery", "background", "python"]
+    ),
+    ServiceTemplate(
+        name="nodejs-api",
+        description="Node.js Express API service",
+        service_type=ServiceType.API,
+        default_configuration={
+            "framework": "express",
+            "port": 3000,
+            "health_check": "/health",
+            "enable_linting": True,
+            "enable_formatting": True,
+            "enable_unit_tests": True,
+            "enable_integration_tests": True,
+            "enable_sonarqube": True,
+            "enable_security_scan": True,
+            "enable_smoke_tests": True,
+            "enable_health_check": True
+        },
+        default_infrastructure_config={
+            "cpu": "500m",
+            "memory": "512Mi",
+            "replicas": 3,
+            "autoscaling": True,
+            "min_replicas": 2,
+            "max_replicas": 10
+        },
+        default_monitoring_config={
+            "metrics": ["http_requests", "response_time", "error_rate"],
+            "alerts": ["high_error_rate", "high_latency", "service_down"],
+            "dashboard": "nodejs-api-dashboard"
+        },
+        tags=["api", "express", "nodejs", "javascript"]
+    )
+)
+
+
 async def create_initial_data():
     """Create initial data in the database."""
     async with AsyncSessionLocal() as db:
@@ -39,138 +169,11 @@ async def create_initial_data():
 
 async def create_service_templates(db: AsyncSession):
     """Create initial service templates."""
-    templates = [
-        ServiceTemplate(
-            name="fastapi-api",
-            description="FastAPI REST API service with comprehensive testing",
-            service_type=ServiceType.API,
-            default_configuration={
-                "framework": "fastapi",
-                "port": 8000,
-                "health_check": "/health",
-                "enable_linting": True,
-                "enable_formatting": True,
-                "enable_unit_tests": True,
-                "enable_integration_tests": True,
-                "enable_sonarqube": True,
-                "enable_security_scan": True,
-                "enable_smoke_tests": True,
-                "enable_health_check": True
-            },
-            default_infrastructure_config={
-                "cpu": "500m",
-                "memory": "512Mi",
-                "replicas": 3,
-                "autoscaling": True,
-                "min_replicas": 2,
-                "max_replicas": 10
-            },
-            default_monitoring_config={
-                "metrics": ["http_requests", "response_time", "error_rate"],
-                "alerts": ["high_error_rate", "high_latency", "service_down"],
-                "dashboard": "api-service-dashboard"
-            },
-            tags=["api", "fastapi", "rest", "python"]
-        ),
-        ServiceTemplate(
-            name="react-web",
-            description="React web application with modern tooling",
-            service_type=ServiceType.WEB,
-            default_configuration={
-                "framework": "react",
-                "build_command": "npm run build",
-                "serve_command": "npm start",
-                "enable_linting": True,
-                "enable_formatting": True,
-                "enable_unit_tests": True,
-                "enable_sonarqube": True,
-                "enable_smoke_tests": True,
-                "enable_health_check": True,
-                "enable_visual_tests": False
-            },
-            default_infrastructure_config={
-                "cpu": "250m",
-                "memory": "256Mi",
-                "replicas": 2,
-                "static_serving": True,
-                "cdn_enabled": True
-            },
-            default_monitoring_config={
-                "metrics": ["page_load_time", "user_interactions", "error_rate"],
-                "alerts": ["high_load_time", "high_error_rate"],
-                "dashboard": "web-service-dashboard"
-            },
-            tags=["web", "react", "frontend", "javascript"]
-        ),
-        ServiceTemplate(
-            name="celery-worker",
-            description="Celery background worker for async tasks",
-            service_type=ServiceType.WORKER,
-            default_configuration={
-                "framework": "celery",
-                "broker": "redis",
-                "concurrency": 4,
-                "enable_linting": True,
-                "enable_formatting": True,
-                "enable_unit_tests": True,
-                "enable_sonarqube": True,
-                "enable_security_scan": True,
-                "enable_smoke_tests": True
-            },
-            default_infrastructure_config={
-                "cpu": "1000m",
-                "memory": "1Gi",
-                "replicas": 2,
-                "autoscaling": True,
-                "min_replicas": 1,
-                "max_replicas": 5
-            },
-            default_monitoring_config={
-                "metrics": ["task_queue_length", "task_processing_time", "worker_health"],
-                "alerts": ["queue_backlog", "worker_failures", "high_processing_time"],
-                "dashboard": "worker-service-dashboard"
-            },
-            tags=["worker", "celery", "background", "python"]
-        ),
-        ServiceTemplate(
-            name="nodejs-api",
-            description="Node.js Express API service",
-            service_type=ServiceType.API,
-            default_configuration={
-                "framework": "express",
-                "port": 3000,
-                "health_check": "/health",
-                "enable_linting": True,
-                "enable_formatting": True,
-                "enable_unit_tests": True,
-                "enable_integration_tests": True,
-                "enable_sonarqube": True,
-                "enable_security_scan": True,
-                "enable_smoke_tests": True,
-                "enable_health_check": True
-            },
-            default_infrastructure_config={
-                "cpu": "500m",
-                "memory": "512Mi",
-                "replicas": 3,
-                "autoscaling": True,
-                "min_replicas": 2,
-                "max_replicas": 10
-            },
-            default_monitoring_config={
-                "metrics": ["http_requests", "response_time", "error_rate"],
-                "alerts": ["high_error_rate", "high_latency", "service_down"],
-                "dashboard": "nodejs-api-dashboard"
-            },
-            tags=["api", "express", "nodejs", "javascript"]
-        )
-    ]
-    
     # Store templates in a way that can be accessed by the API
     # In a real implementation, you might store these in a separate table
-    print(f"📋 Created {len(templates)} service templates")
+    print(f"📋 Created {len(SERVICE_TEMPLATES)} service templates")
     
-    for template in templates:
+    for template in SERVICE_TEMPLATES:
         print(f"  - {template.name}: {template.description}")
 
 
@@ -270,23 +273,10 @@ async def create_sample_services(db: AsyncSession):
         }
     ]
     
-    for service_data in sample_services:
-        service = Service(
-            name=service_data["name"],
-            team=service_data["team"],
-            service_type=service_data["service_type"],
-            environment=service_data["environment"],
-            description=service_data["description"],
-            tags=service_data["tags"],
-            configuration=service_data["configuration"],
-            infrastructure_config=service_data["infrastructure_config"],
-            monitoring_config=service_data["monitoring_config"],
-            status=ServiceStatus.PENDING
-        )
-        
-        db.add(service)
-    
-    await db.commit()
+    # One executemany INSERT and one commit instead of an ORM object per row
+    await ServiceRepository(db).bulk_create(
+        [{**service_data, "status": ServiceStatus.PENDING} for service_data in sample_services]
+    )
     print(f"📦 Created {len(sample_services)} sample services")
 
 
@@ -319,4 +309,10 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Prefer the libuv-based event loop (shipped with uvicorn[standard]) when available
+    try:
+        from uvloop import run
+    except ImportError:
+        from asyncio import run
+    
+    run(main())
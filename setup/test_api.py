@@ -6,14 +6,41 @@ This script provides comprehensive testing for the Platform Engineering API.
 It tests all imports, basic functionality, and provides a simple API server for testing.
 """
 
-from fastapi import FastAPI
+import importlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from fastapi import FastAPI, Response
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
-import boto3
 import yaml
-import kubernetes
-import github
 import pydantic
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Heavy SDKs, imported on first use instead of at startup
+_LAZY_MODULES = frozenset({"boto3", "kubernetes", "github"})
+
+def __getattr__(name):
+    """Import a heavy SDK on first access and cache it in the module globals."""
+    if name in _LAZY_MODULES:
+        module = importlib.import_module(name)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _lazy(name):
+    """Get a lazily imported SDK from inside this module."""
+    return globals()[name] if name in globals() else __getattr__(name)
+
 # Create FastAPI app
 app = FastAPI(
     title="Platform Engineering API",
@@ -21,81 +48,82 @@ app = FastAPI(
     version="1.0.0"
 )
 
-@app.get("/")
-def read_root():
-    """Root endpoint with API information."""
-    return {
-        "message": "Platform Engineering API is running!",
-        "version": "1.0.0",
-        "status": "healthy",
-        "endpoints": {
-            "health": "/health",
-            "services": "/services", 
-            "platform_tools": "/platform-tools",
-            "config": "/config",
-            "docs": "/docs"
-        }
-    }
+# Compress responses of 1 KB and up
+app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-@app.get("/health")
-def health_check():
-    """Health check endpoint for all components."""
-    return {
-        "status": "healthy",
-        "service": "platform-engineering-api",
-        "components": {
-            "fastapi": "✅",
-            "pydantic": "✅",
-            "boto3": "✅",
-            "kubernetes": "✅",
-            "github": "✅",
-            "yaml": "✅"
-        }
+def _json_bytes(payload) -> bytes:
+    """Serialize a response payload once, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+
+# Responses of the static endpoints, serialized once at import
+_ROOT_RESPONSE = _json_bytes({
+    "message": "Platform Engineering API is running!",
+    "version": "1.0.0",
+    "status": "healthy",
+    "endpoints": {
+        "health": "/health",
+        "services": "/services", 
+        "platform_tools": "/platform-tools",
+        "config": "/config",
+        "docs": "/docs"
     }
+})
 
-@app.get("/services")
-def list_services():
-    """List managed services."""
-    return {
-        "services": [
-            {
-                "name": "example-api",
-                "type": "api",
-                "status": "running",
-                "environment": "development",
-                "infrastructure": "aws-ecs",
-                "ci_cd": "github-actions"
-            },
-            {
-                "name": "example-web",
-                "type": "web",
-                "status": "running", 
-                "environment": "development",
-                "infrastructure": "aws-s3",
-                "ci_cd": "github-actions"
-            },
-            {
-                "name": "example-worker",
-                "type": "worker",
-                "status": "running",
-                "environment": "development", 
-                "infrastructure": "aws-lambda",
-                "ci_cd": "github-actions"
-            }
-        ]
+_HEALTH_RESPONSE = _json_bytes({
+    "status": "healthy",
+    "service": "platform-engineering-api",
+    "components": {
+        "fastapi": "✅",
+        "pydantic": "✅",
+        "boto3": "✅",
+        "kubernetes": "✅",
+        "github": "✅",
+        "yaml": "✅"
     }
+})
 
-@app.get("/platform-tools")
-def platform_tools():
-    """Information about platform engineering tools."""
-    return {
+_SERVICES_RESPONSE = _json_bytes({
+    "services": [
+        {
+            "name": "example-api",
+            "type": "api",
+            "status": "running",
+            "environment": "development",
+            "infrastructure": "aws-ecs",
+            "ci_cd": "github-actions"
+        },
+        {
+            "name": "example-web",
+            "type": "web",
+            "status": "running", 
+            "environment": "development",
+            "infrastructure": "aws-s3",
+            "ci_cd": "github-actions"
+        },
+        {
+            "name": "example-worker",
+            "type": "worker",
+            "status": "running",
+            "environment": "development", 
+            "infrastructure": "aws-lambda",
+            "ci_cd": "github-actions"
+        }
+    ]
+})
+
+@lru_cache(maxsize=1)
+def _platform_tools_response() -> bytes:
+    """Serialize /platform-tools on first request, which is when boto3 and kubernetes get imported."""
+    return _json_bytes({
         "tools": {
             "aws": {
-                "boto3_version": boto3.__version__,
+                "boto3_version": _lazy("boto3").__version__,
                 "services": ["ECS", "S3", "Lambda", "CloudWatch"]
             },
             "kubernetes": {
-                "version": kubernetes.__version__,
+                "version": _lazy("kubernetes").__version__,
                 "capabilities": ["deployments", "services", "configmaps"]
             },
             "github": {
@@ -105,57 +133,93 @@ def platform_tools():
                 "capabilities": ["kubernetes_manifests", "github_workflows", "configs"]
             }
         }
-    }
+    })
+
+class Config(BaseModel):
+    app_name: str = "Platform Engineering API"
+    debug: bool = True
+    aws_region: str = "eu-west-2"
+    github_org: str = "platformdavid"
+
+# Pydantic v1 and v2 name the dump method differently; pick it once
+_dump = BaseModel.dict if pydantic.__version__.startswith('1.') else BaseModel.model_dump
+
+_CONFIG_RESPONSE = _json_bytes({
+    "config": _dump(Config()),
+    "pydantic_version": pydantic.__version__
+})
+
+@app.get("/")
+async def read_root():
+    """Root endpoint with API information."""
+    return Response(_ROOT_RESPONSE, media_type="application/json")
+
+@app.get("/health")
+async def health_check():
+    """Health check endpoint for all components."""
+    return Response(_HEALTH_RESPONSE, media_type="application/json")
+
+@app.get("/services")
+async def list_services():
+    """List managed services."""
+    return Response(_SERVICES_RESPONSE, media_type="application/json")
+
+# A plain def so FastAPI runs it in the threadpool: the first call imports
+# boto3 and kubernetes, which would otherwise block the event loop
+@app.get("/platform-tools")
+def platform_tools():
+    """Information about platform engineering tools."""
+    return Response(_platform_tools_response(), media_type="application/json")
 
 @app.get("/config")
-def get_config():
+async def get_config():
     """Current configuration using Pydantic."""
-    class Config(BaseModel):
-        app_name: str = "Platform Engineering API"
-        debug: bool = True
-        aws_region: str = "eu-west-2"
-        github_org: str = "platformdavid"
-    
-    config = Config()
-    
-    # Handle both Pydantic v1 and v2
-    if pydantic.__version__.startswith('1.'):
-        config_dict = config.dict()
-    else:
-        config_dict = config.model_dump()
+    return Response(_CONFIG_RESPONSE, media_type="application/json")
+
+def _probe_import(module_name, dist_name, display_name):
+    """Check one package and return the line to print and whether it passed."""
+    try:
+        version = metadata.version(dist_name)
+        return f"✅ {display_name} imported successfully (v{version})", True
+    except metadata.PackageNotFoundError:
+        pass
     
-    return {
-        "config": config_dict,
-        "pydantic_version": pydantic.__version__
-    }
+    # No dist-info found (e.g. vendored or on sys.path); import it instead
+    try:
+        module = importlib.import_module(module_name)
+        version = getattr(module, '__version__', 'unknown')
+        return f"✅ {display_name} imported successfully (v{version})", True
+    except ImportError as e:
+        return f"❌ {display_name} import failed: {e}", False
+    except Exception as e:
+        return f"⚠️  {display_name} import had issues: {e}", True
 
 def test_imports():
     """Test that all essential imports work."""
     print("🧪 Testing Platform Engineering API imports...")
     print("=" * 60)
     
+    # (module name, distribution name, display name); versions come from
+    # the installed metadata so no package has to be imported
     tests = [
-        ("fastapi", "FastAPI"),
-        ("pydantic", "Pydantic"),
-        ("boto3", "Boto3"),
-        ("yaml", "PyYAML"),
-        ("kubernetes", "Kubernetes"),
-        ("github", "PyGithub"),
-        ("uvicorn", "Uvicorn"),
+        ("fastapi", "fastapi", "FastAPI"),
+        ("pydantic", "pydantic", "Pydantic"),
+        ("boto3", "boto3", "Boto3"),
+        ("yaml", "PyYAML", "PyYAML"),
+        ("kubernetes", "kubernetes", "Kubernetes"),
+        ("github", "PyGithub", "PyGithub"),
+        ("uvicorn", "uvicorn", "Uvicorn"),
     ]
     
-    all_passed = True
+    # Probe concurrently so metadata reads and fallback imports overlap;
+    # results are printed afterwards in the original order
+    with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+        results = list(executor.map(lambda test: _probe_import(*test), tests))
     
-    for module_name, display_name in tests:
-        try:
-            module = __import__(module_name)
-            version = getattr(module, '__version__', 'unknown')
-            print(f"✅ {display_name} imported successfully (v{version})")
-        except ImportError as e:
-            print(f"❌ {display_name} import failed: {e}")
-            all_passed = False
-        except Exception as e:
-            print(f"⚠️  {display_name} import had issues: {e}")
+    all_passed = True
+    for line, passed in results:
+        print(line)
+        all_passed = all_passed and passed
     
     return all_passed
 
@@ -171,11 +235,7 @@ def test_fastapi_functionality():
         
         test_data = TestModel(name="test", value=42)
         
-        # Handle both Pydantic v1 and v2
-        if pydantic.__version__.startswith('1.'):
-            result = test_data.dict()
-        else:
-            result = test_data.model_dump()
+        result = _dump(test_data)
         
         print(f"✅ FastAPI app created successfully")
         print(f"✅ Pydantic model works: {result}")
@@ -190,9 +250,10 @@ def test_platform_tools():
     print("\n⚙️  Testing platform engineering tools...")
     
     try:
-        print(f"✅ Boto3 version: {boto3.__version__}")
+        print(f"✅ Boto3 version: {_lazy('boto3').__version__}")
         print(f"✅ PyYAML loaded successfully")
-        print(f"✅ Kubernetes version: {kubernetes.__version__}")
+        print(f"✅ Kubernetes version: {_lazy('kubernetes').__version__}")
+        _lazy("github")
         print(f"✅ PyGithub loaded successfully")
         
         return True
@@ -233,7 +294,9 @@ def run_comprehensive_test():
         print("   GET /platform-tools - Platform tools info")
         print("   GET /config        - Configuration info")
         print("\n📋 Next steps:")
-        print("   1. Run the API: python -m uvicorn test_api:app --reload")
+        print("   1. Run the API (dev):  python -m uvicorn test_api:app --reload")
+        print(f"      Run the API (prod): python -m uvicorn test_api:app --workers {_SERVE_WORKERS} "
+              f"--loop uvloop --http httptools --limit-concurrency {_SERVE_LIMIT_CONCURRENCY} --no-access-log")
         print("   2. Visit: http://localhost:8000")
         print("   3. Check docs: http://localhost:8000/docs")
     else:
@@ -242,5 +305,40 @@ def run_comprehensive_test():
     
     return all_passed
 
+# One worker per core; extra connections beyond the limit get a 503
+_SERVE_WORKERS = os.cpu_count() or 1
+_SERVE_LIMIT_CONCURRENCY = 1000
+
+def serve():
+    """Serve the test app with one worker per core, on uvloop and httptools when available."""
+    import uvicorn
+    
+    # Both ship with uvicorn[standard]; uvloop isn't available on Windows
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    
+    try:
+        import httptools  # noqa: F401
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+    
+    # Workers need an import string rather than the app object
+    uvicorn.run(
+        "test_api:app",
+        app_dir=str(Path(__file__).parent),
+        workers=_SERVE_WORKERS,
+        loop=loop,
+        http=http,
+        limit_concurrency=_SERVE_LIMIT_CONCURRENCY,
+        access_log=False,
+    )
+
 if __name__ == "__main__":
-    run_comprehensive_test()
+    if "--serve" in sys.argv[1:]:
+        serve()
+    else:
+        run_comprehensive_test()
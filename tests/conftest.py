@@ -0,0 +1,74 @@
+"""
+Shared pytest fixtures for the PlatformDavid Platform Engineering API tests.
+
+The app and HTTP client are created once per session; each test runs its
+database work inside a transaction that is rolled back afterwards.
+"""
+
+import os
+
+# Under pytest-xdist each worker gets its own SQLite file so workers don't
+# contend for the database lock; must be set before the app is imported
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if _XDIST_WORKER:
+    os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///./platform_engineering_{_XDIST_WORKER}.db")
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import Base, engine, get_db
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Use asyncio for the whole session so the shared client keeps one loop."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def client():
+    """Test client fixture, shared across the session since no test changes app state."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as ac:
+        yield ac
+
+
+@pytest.fixture(scope="session")
+async def database_tables(anyio_backend):
+    """Create all tables once per session; ASGITransport doesn't run the app lifespan."""
+    # Import the models so they are registered on the metadata
+    from app.models import deployment, service  # noqa: F401
+    
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+async def db_session(database_tables):
+    """
+    Run each test's requests on one session joined to an outer transaction.
+    
+    Commits made by the endpoints become SAVEPOINT releases, and the outer
+    transaction is rolled back after the test so no rows leak between tests.
+    """
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        session = AsyncSession(
+            bind=connection,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )
+        
+        async def override_get_db():
+            yield session
+        
+        app.dependency_overrides[get_db] = override_get_db
+        try:
+            yield session
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            await session.close()
+            await transaction.rollback()